@@ -1,19 +1,84 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Header, Query
+from fastapi import FastAPI, HTTPException, Depends, status, Header, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, EmailStr
+from pydantic_core import to_json
 from typing import Optional, List
 from datetime import datetime, timedelta, timezone
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
 import bcrypt
 import jwt
 import os
+import json
+import asyncio
 import uuid
+import time
+import hashlib
+import bisect
+import secrets
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 # Environment variables
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 JWT_SECRET = os.environ.get('JWT_SECRET', 'campuspool_secret_key_2024')
 JWT_ALGORITHM = 'HS256'
+JWT_DECODE_ALGORITHMS = (JWT_ALGORITHM,)
+
+# bcrypt work factor; each +1 doubles hashing time. Keep 12 in production, lower only for dev/testing
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+
+# MongoDB connection pool sizing (one shared client per process)
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '10'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000'))
+
+# Upper bound on the limit parameter of paginated list endpoints
+MAX_PAGE_SIZE = 200
+
+# Worker processes started by the __main__ entry point
+UVICORN_WORKERS = int(os.environ.get('UVICORN_WORKERS', '1'))
+
+# Authenticated user cache (skips JWT decode + user lookup for repeat tokens).
+# Disabling or suspending a user only clears the cache of the worker that
+# handled it, so the cache is off (0) by default when running several workers
+AUTH_CACHE_TTL_SECONDS = int(os.environ.get('AUTH_CACHE_TTL_SECONDS', '60' if UVICORN_WORKERS == 1 else '0'))
+AUTH_CACHE_MAX_SIZE = 4096
+# The authenticated user never needs its password hash or warning history
+AUTH_USER_PROJECTION = {"password_hash": 0, "warnings": 0}
+# Login needs the hash to verify plus the fields echoed back in the response
+LOGIN_USER_PROJECTION = {
+    "_id": 0,
+    **dict.fromkeys(["id", "email", "name", "role", "branch", "academic_year", "password_hash", "is_disabled"], 1)
+}
+# Another user's profile shows only their public fields
+PUBLIC_PROFILE_PROJECTION = {
+    "_id": 0,
+    **dict.fromkeys(["id", "name", "role", "branch", "academic_year", "is_verified", "created_at"], 1)
+}
+# Ride fields read by the public ride list and detail responses
+RIDE_VIEW_PROJECTION = {
+    "_id": 0,
+    **dict.fromkeys([
+        "id", "driver_id", "driver_name", "driver_branch", "driver_year",
+        "source", "destination", "departure_time", "total_seats", "available_seats",
+        "estimated_cost", "pickup_point", "is_recurring", "recurrence_pattern",
+        "event_tag", "distance_km", "status"
+    ], 1)
+}
+
+# Recent bcrypt verification results, keyed by a keyed digest of (password, hash)
+PASSWORD_CACHE_MAX_SIZE = 1024
+
+# Earned badges per user, so profile views don't recompute stats and streak each time
+BADGE_CACHE_TTL_SECONDS = 60
+BADGE_CACHE_MAX_SIZE = 4096
+
+# Custom event tags are cached in-process and refreshed after this many seconds
+EVENT_TAG_CACHE_TTL_SECONDS = 60
 
 # Trust thresholds
 TRUSTED_RATING_THRESHOLD = 4.5
@@ -42,6 +107,14 @@ PICKUP_POINTS = [
     "Parking Lot B",
     "Bus Stop"
 ]
+VALID_PICKUP_POINTS = frozenset(PICKUP_POINTS)
+
+# Offsets from the first departure for each recurrence pattern
+RECURRENCE_OFFSETS = {
+    "daily": tuple(timedelta(days=i) for i in range(1, 8)),
+    "weekdays": tuple(timedelta(days=i) for i in range(1, 15)),
+    "weekly": tuple(timedelta(weeks=i) for i in range(1, 5)),
+}
 
 # Predefined event tags
 EVENT_TAGS = [
@@ -54,6 +127,7 @@ EVENT_TAGS = [
     {"id": "cultural", "name": "Cultural Event", "icon": "🎭", "color": "#ec4899"},
     {"id": "holiday", "name": "Holiday Trip", "icon": "🌴", "color": "#10b981"}
 ]
+EVENT_TAGS_BY_ID = {t["id"]: t for t in EVENT_TAGS}
 
 # Academic branches
 ACADEMIC_BRANCHES = [
@@ -68,9 +142,11 @@ ACADEMIC_BRANCHES = [
     "Aerospace",
     "Other"
 ]
+VALID_ACADEMIC_BRANCHES = frozenset(ACADEMIC_BRANCHES)
 
 # Academic years
 ACADEMIC_YEARS = ["1st Year", "2nd Year", "3rd Year", "4th Year", "5th Year", "Alumni"]
+VALID_ACADEMIC_YEARS = frozenset(ACADEMIC_YEARS)
 
 # Badge definitions
 BADGE_DEFINITIONS = [
@@ -86,48 +162,188 @@ BADGE_DEFINITIONS = [
     {"id": "money_saver", "name": "Money Saver", "description": "Saved $100 on rides", "icon": "💰", "requirement": 100, "type": "savings"}
 ]
 
+# Badges grouped by type and sorted by requirement, so earned badges are a bisect away
+BADGE_TYPES = ["rides", "eco", "streak", "savings"]
+
+def _sorted_badges(badge_type: str) -> List[dict]:
+    badges = [b for b in BADGE_DEFINITIONS if b.get("type", "rides") == badge_type]
+    return sorted(badges, key=lambda b: b["requirement"])
+
+BADGE_THRESHOLDS = {t: [b["requirement"] for b in _sorted_badges(t)] for t in BADGE_TYPES}
+BADGE_SUMMARIES = {
+    t: [{"id": b["id"], "name": b["name"], "description": b["description"], "icon": b["icon"]}
+        for b in _sorted_badges(t)]
+    for t in BADGE_TYPES
+}
+
 # Report categories
 REPORT_CATEGORIES = ["safety", "behavior", "misuse", "fraud", "other"]
 
+# Ride lifecycle states a driver may set
+RIDE_STATUSES = frozenset(["posted", "in_progress", "completed", "cancelled"])
+
 # SOS Status types
 SOS_STATUSES = ["active", "under_review", "resolved"]
 
 # User action types for admin
 ADMIN_ACTION_TYPES = ["warn", "suspend", "disable", "enable", "revoke_verification", "verify"]
 
+# Pre-encoded bodies for endpoints that only return constants
+def encode_static_json(content: dict) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class CoreJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core's compiled serializer instead of json.dumps"""
+    def render(self, content) -> bytes:
+        return to_json(content)
+
+def json_etag(body: bytes) -> str:
+    # Weak, since GZipMiddleware serves gzip and identity bodies under the same tag
+    return 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+PICKUP_POINTS_JSON = encode_static_json({"pickup_points": PICKUP_POINTS})
+ACADEMIC_OPTIONS_JSON = encode_static_json({"branches": ACADEMIC_BRANCHES, "academic_years": ACADEMIC_YEARS})
+BADGES_JSON = encode_static_json({"badges": BADGE_DEFINITIONS})
+REPORT_CATEGORIES_JSON = encode_static_json({"categories": REPORT_CATEGORIES})
+PICKUP_POINTS_ETAG = json_etag(PICKUP_POINTS_JSON)
+ACADEMIC_OPTIONS_ETAG = json_etag(ACADEMIC_OPTIONS_JSON)
+BADGES_ETAG = json_etag(BADGES_JSON)
+REPORT_CATEGORIES_ETAG = json_etag(REPORT_CATEGORIES_JSON)
+
+# Constants only change on deploy; event tags are revalidated on every use
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+EVENT_TAGS_CACHE_CONTROL = "no-cache"
+
+# Indexes created at startup, grouped by collection
+DB_INDEXES = {
+    # Every collection addressed by its own uuid is looked up by id first
+    "users": [IndexModel("id", unique=True), IndexModel("email", unique=True)],
+    "rides": [
+        # Also serves every $lookup from ride_requests into rides on foreignField "id"
+        IndexModel("id", unique=True),
+        # Ride search matches on status and walks departure times in order;
+        # the seat range is filtered during the scan so the sort stays indexed
+        IndexModel([("status", 1), ("departure_time", 1)]),
+        IndexModel("departure_time"),
+        IndexModel("event_tag"),
+        IndexModel([("driver_id", 1), ("status", 1)]),
+        # Driver's rides and history list newest departures first
+        IndexModel([("driver_id", 1), ("departure_time", -1)])
+    ],
+    "ride_requests": [
+        IndexModel("id", unique=True),
+        IndexModel([("ride_id", 1), ("status", 1)]),
+        # A ride's request list shows urgent requests first, then oldest first
+        IndexModel([("ride_id", 1), ("is_urgent", -1), ("created_at", 1)]),
+        # Rider history lists accepted requests newest first
+        IndexModel([("rider_id", 1), ("status", 1), ("created_at", -1)]),
+        # Duplicate-request and accepted-rider checks filter on both ids
+        IndexModel([("ride_id", 1), ("rider_id", 1)]),
+        # My-requests lists a rider's requests newest first
+        IndexModel([("rider_id", 1), ("created_at", -1)])
+    ],
+    "ratings": [
+        IndexModel([("ride_id", 1), ("rater_id", 1)], unique=True),
+        IndexModel([("rated_user_id", 1), ("rating", 1)])
+    ],
+    "safe_completions": [IndexModel([("ride_id", 1), ("confirmed_by", 1)])],
+    "user_streaks": [IndexModel("user_id")],
+    "custom_events": [IndexModel("created_by")],
+    # Admin specific indexes
+    "admin_audit_logs": [
+        IndexModel([("admin_id", 1), ("created_at", -1)]),
+        IndexModel([("action_type", 1), ("created_at", -1)]),
+        IndexModel("created_at")
+    ],
+    "sos_events": [
+        IndexModel("ride_id"),
+        # Admin SOS list filters by status and shows newest first
+        IndexModel([("status", 1), ("created_at", -1)]),
+        IndexModel([("reporter_id", 1), ("created_at", -1)]),
+        IndexModel([("created_at", -1)])
+    ],
+    "reports": [
+        IndexModel([("status", 1), ("created_at", -1)]),
+        IndexModel([("category", 1), ("created_at", -1)]),
+        IndexModel([("created_at", -1)]),
+        IndexModel([("reporter_id", 1), ("created_at", -1)]),
+        IndexModel([("target_type", 1), ("target_id", 1), ("created_at", -1)])
+    ],
+    "user_verifications": [IndexModel([("user_id", 1), ("created_at", -1)])]
+}
+
+# Indexes no query uses any more, dropped at startup so writes stop maintaining them
+DB_DROPPED_INDEXES = {
+    # Ride search scores substring matches in an aggregation rather than via $text;
+    # status lookups use the (status, departure_time) prefix
+    "rides": ["source_text_destination_text", "status_1"],
+    # Single-field indexes below are covered by a compound index with the same prefix
+    "ride_requests": [
+        "ride_id_1",
+        # The urgent request count is a $group over the collection, which no index serves
+        "is_urgent_1"
+    ],
+    "ratings": ["rated_user_id_1"],
+    "safe_completions": ["ride_id_1"],
+    "admin_audit_logs": ["admin_id_1"],
+    "sos_events": ["status_1"],
+    "reports": ["status_1", "category_1"],
+    "user_verifications": ["user_id_1"]
+}
+
 # Database client
 client = None
 db = None
 
+# token digest -> (user, token exp epoch, cached-until epoch)
+auth_cache = OrderedDict()
+
+# keyed digest of (password, stored hash) -> bool; the key never leaves the process
+password_cache = OrderedDict()
+password_cache_key = secrets.token_bytes(32)
+
+# bcrypt releases the GIL, so one thread per core saturates the CPU; a dedicated
+# pool keeps login bursts from occupying the shared threadpool
+password_hash_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+# user id -> (earned badges, cached-until epoch)
+badge_cache = OrderedDict()
+
+# (loaded-at epoch, custom event tags keyed by id)
+custom_event_tags_cache = None
+
+# (custom tags dict the body was built from, encoded body, etag)
+event_tags_body_cache = None
+
+async def drop_index_if_exists(collection, name: str):
+    try:
+        await collection.drop_index(name)
+    except OperationFailure:
+        pass  # already gone, or the collection doesn't exist yet
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global client, db
-    client = AsyncIOMotorClient(MONGO_URL)
+    client = AsyncMongoClient(
+        MONGO_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=300000,
+        maxConnecting=4,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        tz_aware=True
+    )
     db = client.campuspool
-    # Create indexes
-    await db.users.create_index("email", unique=True)
-    await db.rides.create_index("status")
-    await db.rides.create_index("departure_time")
-    await db.rides.create_index("event_tag")
-    await db.rides.create_index([("source", "text"), ("destination", "text")])
-    await db.ride_requests.create_index("ride_id")
-    await db.ride_requests.create_index("is_urgent")
-    await db.ratings.create_index([("ride_id", 1), ("rater_id", 1)], unique=True)
-    await db.ratings.create_index("rated_user_id")
-    await db.safe_completions.create_index("ride_id")
-    await db.user_streaks.create_index("user_id")
-    await db.custom_events.create_index("created_by")
-    # Admin specific indexes
-    await db.admin_audit_logs.create_index("admin_id")
-    await db.admin_audit_logs.create_index("created_at")
-    await db.sos_events.create_index("ride_id")
-    await db.sos_events.create_index("status")
-    await db.reports.create_index("status")
-    await db.reports.create_index("category")
-    await db.user_verifications.create_index("user_id")
+    # Create indexes, one createIndexes command per collection, and drop retired ones, all concurrently
+    await asyncio.gather(*(
+        db[collection].create_indexes(indexes) for collection, indexes in DB_INDEXES.items()
+    ), *(
+        drop_index_if_exists(db[collection], name)
+        for collection, names in DB_DROPPED_INDEXES.items() for name in names
+    ))
     print("Database connected and indexes created")
     yield
-    client.close()
+    await client.close()
     print("Database connection closed")
 
 app = FastAPI(title="CampusPool API", lifespan=lifespan)
@@ -141,6 +357,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Ride and admin lists repeat the same keys per item and compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Pydantic Models
 class UserSignup(BaseModel):
     email: EmailStr
@@ -230,11 +449,44 @@ class VerificationRequest(BaseModel):
     reason: Optional[str] = None
 
 # Helper functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+# bcrypt is CPU-bound, so hashing runs on its own executor instead of the event loop
+async def hash_password(password: str) -> str:
+    hashed = await asyncio.get_running_loop().run_in_executor(
+        password_hash_executor, bcrypt.hashpw, password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    )
+    return hashed.decode()
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+def password_needs_rehash(hashed: str) -> bool:
+    """Whether a stored bcrypt hash ($2b$<cost>$...) was made at a different cost than BCRYPT_ROUNDS"""
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+async def rehash_password(user_id: str, password: str, old_hash: str):
+    """Re-hash a password at the current cost, unless it was changed in the meantime"""
+    new_hash = await hash_password(password)
+    await db.users.update_one(
+        {"id": user_id, "password_hash": old_hash},
+        {"$set": {"password_hash": new_hash}}
+    )
+
+async def verify_password(password: str, hashed: str) -> bool:
+    cache_key = hashlib.blake2b(
+        password.encode() + b"\0" + hashed.encode(), key=password_cache_key, digest_size=16
+    ).digest()
+    cached = password_cache.get(cache_key)
+    if cached is not None:
+        password_cache.move_to_end(cache_key)
+        return cached
+    
+    result = await asyncio.get_running_loop().run_in_executor(
+        password_hash_executor, bcrypt.checkpw, password.encode(), hashed.encode()
+    )
+    password_cache[cache_key] = result
+    if len(password_cache) > PASSWORD_CACHE_MAX_SIZE:
+        password_cache.popitem(last=False)
+    return result
 
 def create_token(user_id: str) -> str:
     payload = {
@@ -243,19 +495,42 @@ def create_token(user_id: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+def _auth_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def invalidate_cached_user(user_id: str):
+    """Drop cached auth entries for a user whose record has changed"""
+    stale = [key for key, entry in auth_cache.items() if entry[0]["id"] == user_id]
+    for key in stale:
+        del auth_cache[key]
+
 async def get_current_user(authorization: Optional[str] = Header(None)):
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Authorization token required")
     
     token = authorization.split(" ")[1]
+    cache_key = _auth_cache_key(token)
+    now = time.time()
+    cached = auth_cache.get(cache_key)
+    if cached:
+        user, token_exp, cached_until = cached
+        if now < cached_until and now < token_exp:
+            auth_cache.move_to_end(cache_key)
+            return user
+        del auth_cache[cache_key]
+    
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user = await db.users.find_one({"id": payload["user_id"]})
+        payload = jwt.decode(token, JWT_SECRET, algorithms=JWT_DECODE_ALGORITHMS)
+        user = await db.users.find_one({"id": payload["user_id"]}, AUTH_USER_PROJECTION)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         # Check if user is disabled
         if user.get("is_disabled", False):
             raise HTTPException(status_code=403, detail="Your account has been disabled. Contact support.")
+        if AUTH_CACHE_TTL_SECONDS > 0:
+            auth_cache[cache_key] = (user, payload["exp"], now + AUTH_CACHE_TTL_SECONDS)
+            if len(auth_cache) > AUTH_CACHE_MAX_SIZE:
+                auth_cache.popitem(last=False)
         return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
@@ -285,80 +560,105 @@ async def log_admin_action(admin_id: str, admin_name: str, action_type: str, tar
     await db.admin_audit_logs.insert_one(log_entry)
     return log_entry
 
-def calculate_route_similarity(ride_source: str, ride_dest: str, search_source: str, search_dest: str) -> int:
-    """Calculate similarity score between ride route and search criteria"""
-    score = 0
-    
-    if search_source:
-        ride_source_lower = ride_source.lower()
-        search_source_lower = search_source.lower()
-        if search_source_lower in ride_source_lower or ride_source_lower in search_source_lower:
-            score += 50
-        elif any(word in ride_source_lower for word in search_source_lower.split()):
-            score += 25
-    
-    if search_dest:
-        ride_dest_lower = ride_dest.lower()
-        search_dest_lower = search_dest.lower()
-        if search_dest_lower in ride_dest_lower or ride_dest_lower in search_dest_lower:
-            score += 50
-        elif any(word in ride_dest_lower for word in search_dest_lower.split()):
-            score += 25
-    
-    return score
-
-async def generate_recurring_rides(ride_data: dict, user_id: str, pattern: str):
-    """Generate future ride entries based on recurrence pattern"""
-    base_time = ride_data["departure_time"]
-    rides_to_create = []
-    
-    if pattern == "weekdays":
-        for i in range(1, 15):
-            next_date = base_time + timedelta(days=i)
-            if next_date.weekday() < 5:
-                new_ride = ride_data.copy()
-                new_ride["id"] = str(uuid.uuid4())
-                new_ride["departure_time"] = next_date
-                new_ride["parent_ride_id"] = ride_data["id"]
-                rides_to_create.append(new_ride)
-    elif pattern == "daily":
-        for i in range(1, 8):
-            new_ride = ride_data.copy()
-            new_ride["id"] = str(uuid.uuid4())
-            new_ride["departure_time"] = base_time + timedelta(days=i)
-            new_ride["parent_ride_id"] = ride_data["id"]
-            rides_to_create.append(new_ride)
-    elif pattern == "weekly":
-        for i in range(1, 5):
-            new_ride = ride_data.copy()
-            new_ride["id"] = str(uuid.uuid4())
-            new_ride["departure_time"] = base_time + timedelta(weeks=i)
-            new_ride["parent_ride_id"] = ride_data["id"]
-            rides_to_create.append(new_ride)
-    
-    if rides_to_create:
-        await db.rides.insert_many(rides_to_create)
-    
-    return len(rides_to_create)
+async def stream_json_page(key: str, cursor, serialize, **trailer):
+    """Stream {key: [...], **trailer} as JSON straight off a cursor, one document at a time.
+    
+    The status line is sent before the first document, so a cursor error partway
+    through ends the response as a truncated 200 body rather than a 500.
+    """
+    yield ('{"%s":[' % key).encode("utf-8")
+    separator = b""
+    async for doc in cursor:
+        yield separator + encode_static_json(serialize(doc))
+        separator = b","
+    yield b"]," + encode_static_json(trailer)[1:] if trailer else b"]}"
 
-async def get_user_trust_info(user_id: str) -> dict:
-    """Calculate trust information for a user"""
-    driver_rides = await db.rides.count_documents({"driver_id": user_id, "status": "completed"})
-    rider_requests = await db.ride_requests.count_documents({"rider_id": user_id, "status": "accepted"})
-    total_rides = driver_rides + rider_requests
+def serialize_audit_log(log: dict) -> dict:
+    return {
+        "id": log["id"],
+        "adminId": log["admin_id"],
+        "adminName": log["admin_name"],
+        "actionType": log["action_type"],
+        "targetType": log["target_type"],
+        "targetId": log["target_id"],
+        "details": log.get("details"),
+        "createdAt": log["created_at"].isoformat()
+    }
+
+async def get_custom_event_tags() -> dict:
+    """Get custom event tags keyed by id, served from a short-lived cache"""
+    global custom_event_tags_cache
+    now = time.time()
+    if custom_event_tags_cache and now - custom_event_tags_cache[0] < EVENT_TAG_CACHE_TTL_SECONDS:
+        return custom_event_tags_cache[1]
     
-    pipeline = [
-        {"$match": {"rated_user_id": user_id}},
-        {"$group": {"_id": None, "avgRating": {"$avg": "$rating"}, "count": {"$sum": 1}}}
+    custom_tags = await db.custom_events.find({}).to_list(100)
+    tags = {
+        t["id"]: {"id": t["id"], "name": t["name"], "icon": t["icon"], "color": t["color"]}
+        for t in custom_tags
+    }
+    custom_event_tags_cache = (now, tags)
+    return tags
+
+def invalidate_custom_event_tags():
+    """Force the next event tag lookup to reload custom tags"""
+    global custom_event_tags_cache
+    custom_event_tags_cache = None
+
+async def get_all_event_tags() -> dict:
+    """Get predefined and custom event tags keyed by id"""
+    return {**EVENT_TAGS_BY_ID, **(await get_custom_event_tags())}
+
+def cached_json_response(body: bytes, etag: str, cache_control: str, if_none_match: Optional[str]) -> Response:
+    """Serve a pre-encoded JSON body, or 304 when the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    # If-None-Match uses weak comparison, so W/ prefixes (ours, or added by a proxy) are ignored
+    opaque_tag = etag.removeprefix("W/")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or opaque_tag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def route_similarity_expression(field: str, search: str) -> dict:
+    """Build an aggregation expression scoring one ride field against a search term"""
+    # The search term is lowercased and split once here; the ride field is
+    # lowercased once per document and bound with $let for every comparison.
+    # User text is wrapped in $literal so a leading $ isn't read as a field path
+    search_lower = search.lower()
+    search_literal = {"$literal": search_lower}
+    field_lower = "$$field_lower"
+    
+    def contains(haystack, needle):
+        return {"$gte": [{"$indexOfCP": [haystack, needle]}, 0]}
+    
+    word_matches = [
+        contains(field_lower, {"$literal": word})
+        for word in dict.fromkeys(search_lower.split())
     ]
-    rating_result = await db.ratings.aggregate(pipeline).to_list(1)
-    
-    avg_rating = 0
-    rating_count = 0
-    if rating_result:
-        avg_rating = round(rating_result[0]["avgRating"], 1)
-        rating_count = rating_result[0]["count"]
+    return {"$let": {
+        "vars": {"field_lower": {"$toLower": f"${field}"}},
+        "in": {"$cond": [
+            {"$or": [contains(field_lower, search_literal), contains(search_literal, field_lower)]},
+            50,
+            {"$cond": [{"$or": word_matches or [False]}, 25, 0]}
+        ]}
+    }}
+
+def generate_recurring_rides(ride_data: dict, pattern: str) -> List[dict]:
+    """Build future ride entries based on recurrence pattern (not yet inserted)"""
+    base_time = ride_data["departure_time"]
+    departures = (base_time + offset for offset in RECURRENCE_OFFSETS.get(pattern, ()))
     
+    return [
+        {**ride_data, "id": str(uuid.uuid4()), "departure_time": departure, "parent_ride_id": ride_data["id"]}
+        for departure in departures
+        if pattern != "weekdays" or departure.weekday() < 5
+    ]
+
+def build_trust_info(total_rides: int, avg_rating: float, rating_count: int) -> dict:
+    """Derive the trust label from ride and rating counts"""
     trust_label = "new_user"
     if total_rides < NEW_USER_MAX_RIDES:
         trust_label = "new_user"
@@ -376,38 +676,139 @@ async def get_user_trust_info(user_id: str) -> dict:
         "trustLabel": trust_label
     }
 
-async def calculate_user_statistics(user_id: str) -> dict:
-    """Calculate comprehensive statistics for a user"""
-    user = await db.users.find_one({"id": user_id})
-    if not user:
-        return {}
+async def get_user_trust_info(user_id: str) -> dict:
+    """Calculate trust information for a user"""
+    pipeline = [
+        {"$match": {"rated_user_id": user_id}},
+        {"$group": {"_id": None, "avgRating": {"$avg": "$rating"}, "count": {"$sum": 1}}}
+    ]
+    # The three reads are independent, so they share one round-trip of latency
+    driver_rides, rider_requests, rating_cursor = await asyncio.gather(
+        db.rides.count_documents({"driver_id": user_id, "status": "completed"}),
+        db.ride_requests.count_documents({"rider_id": user_id, "status": "accepted"}),
+        db.ratings.aggregate(pipeline)
+    )
+    total_rides = driver_rides + rider_requests
+    rating_result = await rating_cursor.to_list(1)
     
-    # Rides offered (as driver)
-    rides_offered = await db.rides.count_documents({"driver_id": user_id, "status": "completed"})
+    avg_rating = 0
+    rating_count = 0
+    if rating_result:
+        avg_rating = round(rating_result[0]["avgRating"], 1)
+        rating_count = rating_result[0]["count"]
     
-    # Rides taken (as rider)
-    rides_taken_cursor = db.ride_requests.find({"rider_id": user_id, "status": "accepted"})
-    rides_taken_list = await rides_taken_cursor.to_list(1000)
+    return build_trust_info(total_rides, avg_rating, rating_count)
+
+async def get_users_trust_info(user_ids: List[str]) -> dict:
+    """Calculate trust information for many users at once, keyed by user id"""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return {}
     
-    rides_taken = 0
-    total_distance_as_rider = 0
-    total_cost_as_rider = 0
+    # The three aggregations are independent, so they run concurrently
+    cursors = await asyncio.gather(
+        db.rides.aggregate([
+            {"$match": {"driver_id": {"$in": user_ids}, "status": "completed"}},
+            {"$group": {"_id": "$driver_id", "count": {"$sum": 1}}}
+        ]),
+        db.ride_requests.aggregate([
+            {"$match": {"rider_id": {"$in": user_ids}, "status": "accepted"}},
+            {"$group": {"_id": "$rider_id", "count": {"$sum": 1}}}
+        ]),
+        db.ratings.aggregate([
+            {"$match": {"rated_user_id": {"$in": user_ids}}},
+            {"$group": {"_id": "$rated_user_id", "avgRating": {"$avg": "$rating"}, "count": {"$sum": 1}}}
+        ])
+    )
+    driver_counts, rider_counts, rating_results = await asyncio.gather(
+        *(cursor.to_list(None) for cursor in cursors)
+    )
     
-    for req in rides_taken_list:
-        ride = await db.rides.find_one({"id": req["ride_id"], "status": "completed"})
-        if ride:
-            rides_taken += 1
-            distance = ride.get("distance_km", AVERAGE_RIDE_DISTANCE_KM)
-            total_distance_as_rider += distance
-            # Calculate shared cost
-            accepted_count = await db.ride_requests.count_documents({"ride_id": ride["id"], "status": "accepted"})
-            cost_per_rider = ride["estimated_cost"] / max(accepted_count, 1)
-            total_cost_as_rider += cost_per_rider
-    
-    # Distance as driver
-    driver_rides_cursor = db.rides.find({"driver_id": user_id, "status": "completed"})
-    driver_rides_list = await driver_rides_cursor.to_list(1000)
-    total_distance_as_driver = sum(r.get("distance_km", AVERAGE_RIDE_DISTANCE_KM) for r in driver_rides_list)
+    total_rides = {uid: 0 for uid in user_ids}
+    for r in driver_counts + rider_counts:
+        total_rides[r["_id"]] += r["count"]
+    ratings = {r["_id"]: r for r in rating_results}
+    
+    result = {}
+    for uid in user_ids:
+        rating = ratings.get(uid)
+        avg_rating = round(rating["avgRating"], 1) if rating else 0
+        rating_count = rating["count"] if rating else 0
+        result[uid] = build_trust_info(total_rides[uid], avg_rating, rating_count)
+    return result
+
+async def get_rides_by_id(ride_ids: List[str], fields: List[str]) -> dict:
+    """Load the given fields for many rides at once, keyed by ride id"""
+    if not ride_ids:
+        return {}
+    projection = {"_id": 0, "id": 1, **{f: 1 for f in fields}}
+    rides = await db.rides.find({"id": {"$in": list(set(ride_ids))}}, projection).to_list(None)
+    return {ride["id"]: ride for ride in rides}
+
+async def get_request_with_driver(request_id: str) -> Optional[dict]:
+    """Load a ride request plus its ride's driver_id in a single query"""
+    results = await (await db.ride_requests.aggregate([
+        {"$match": {"id": request_id}},
+        {"$limit": 1},
+        {"$lookup": {"from": "rides", "localField": "ride_id", "foreignField": "id", "as": "ride"}},
+        {"$project": {
+            "_id": 0,
+            "id": 1,
+            "ride_id": 1,
+            "status": 1,
+            "driver_id": {"$arrayElemAt": ["$ride.driver_id", 0]}
+        }}
+    ])).to_list(1)
+    return results[0] if results else None
+
+async def get_users_by_id(user_ids: List[str], fields: List[str]) -> dict:
+    """Load the given fields for many users at once, keyed by user id"""
+    if not user_ids:
+        return {}
+    projection = {"_id": 0, "id": 1, **{f: 1 for f in fields}}
+    users = await db.users.find({"id": {"$in": list(set(user_ids))}}, projection).to_list(None)
+    return {u["id"]: u for u in users}
+
+async def count_accepted_requests(ride_ids: List[str]) -> dict:
+    """Count accepted requests for many rides at once, keyed by ride id"""
+    if not ride_ids:
+        return {}
+    results = await (await db.ride_requests.aggregate([
+        {"$match": {"ride_id": {"$in": ride_ids}, "status": "accepted"}},
+        {"$group": {"_id": "$ride_id", "count": {"$sum": 1}}}
+    ])).to_list(None)
+    return {r["_id"]: r["count"] for r in results}
+
+async def count_matching(collection, **conditions) -> dict:
+    """Count all documents plus those matching each named condition in one pass"""
+    pipeline = [{"$group": {
+        "_id": None,
+        "total": {"$sum": 1},
+        **{name: {"$sum": {"$cond": [cond, 1, 0]}} for name, cond in conditions.items()}
+    }}]
+    result = await (await collection.aggregate(pipeline)).to_list(1)
+    if not result:
+        return {"total": 0, **{name: 0 for name in conditions}}
+    return result[0]
+
+async def get_completed_distance_km() -> float:
+    """Total distance across all completed rides, summed by MongoDB"""
+    result = await (await db.rides.aggregate([
+        {"$match": {"status": "completed"}},
+        {"$group": {
+            "_id": None,
+            "distance": {"$sum": {"$ifNull": ["$distance_km", AVERAGE_RIDE_DISTANCE_KM]}}
+        }}
+    ])).to_list(1)
+    return result[0]["distance"] if result else 0
+
+def build_user_statistics(rider_totals: Optional[dict], driver_totals: Optional[dict]) -> dict:
+    """Derive the statistics response from a user's rider and driver totals"""
+    rides_taken = rider_totals["count"] if rider_totals else 0
+    total_distance_as_rider = rider_totals["distance"] if rider_totals else 0
+    total_cost_as_rider = rider_totals["cost"] if rider_totals else 0
+    rides_offered = driver_totals["count"] if driver_totals else 0
+    total_distance_as_driver = driver_totals["distance"] if driver_totals else 0
     
     total_distance = total_distance_as_rider + total_distance_as_driver
     
@@ -427,149 +828,192 @@ async def calculate_user_statistics(user_id: str) -> dict:
         "co2SavedKg": round(co2_saved, 2)
     }
 
+async def calculate_users_statistics(user_ids: List[str]) -> dict:
+    """Calculate statistics for many users at once, keyed by user id"""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return {}
+    
+    # Completed rides taken as a rider, each with its accepted riders for the cost
+    # split, and rides given as a driver; both totals are computed by MongoDB
+    rider_cursor, driver_cursor = await asyncio.gather(
+        db.ride_requests.aggregate([
+            {"$match": {"rider_id": {"$in": user_ids}, "status": "accepted"}},
+            {"$lookup": {"from": "rides", "localField": "ride_id", "foreignField": "id", "as": "ride"}},
+            {"$unwind": "$ride"},
+            {"$match": {"ride.status": "completed"}},
+            {"$lookup": {"from": "ride_requests", "localField": "ride_id", "foreignField": "ride_id", "as": "ride_requests"}},
+            {"$group": {
+                "_id": "$rider_id",
+                "count": {"$sum": 1},
+                "distance": {"$sum": {"$ifNull": ["$ride.distance_km", AVERAGE_RIDE_DISTANCE_KM]}},
+                "cost": {"$sum": {"$divide": [
+                    "$ride.estimated_cost",
+                    {"$max": [{"$size": {"$filter": {
+                        "input": "$ride_requests",
+                        "cond": {"$eq": ["$$this.status", "accepted"]}
+                    }}}, 1]}
+                ]}}
+            }}
+        ]),
+        db.rides.aggregate([
+            {"$match": {"driver_id": {"$in": user_ids}, "status": "completed"}},
+            {"$group": {
+                "_id": "$driver_id",
+                "count": {"$sum": 1},
+                "distance": {"$sum": {"$ifNull": ["$distance_km", AVERAGE_RIDE_DISTANCE_KM]}}
+            }}
+        ])
+    )
+    rider_results, driver_results = await asyncio.gather(rider_cursor.to_list(None), driver_cursor.to_list(None))
+    
+    rider_totals = {r["_id"]: r for r in rider_results}
+    driver_totals = {r["_id"]: r for r in driver_results}
+    return {
+        uid: build_user_statistics(rider_totals.get(uid), driver_totals.get(uid))
+        for uid in user_ids
+    }
+
+async def calculate_user_statistics(user_id: str) -> dict:
+    """Calculate comprehensive statistics for a user"""
+    return (await calculate_users_statistics([user_id]))[user_id]
+
+def count_streaks(ride_dates: set, today) -> tuple:
+    """Current and longest runs of consecutive ride days, using a bitmask of days"""
+    # Bit k is set when there was a ride k days before the latest date considered
+    latest = max(max(ride_dates), today)
+    mask = 0
+    for ride_date in ride_dates:
+        mask |= 1 << (latest - ride_date).days
+    
+    # The current streak counts back from today, or from yesterday if today has no ride yet
+    recent = mask >> (latest - today).days
+    if not recent & 1:
+        recent >>= 1
+    current_streak = min((~recent & (recent + 1)).bit_length() - 1, 60)
+    
+    # Each pass shortens every run of set bits by one; the longest run survives the most passes
+    longest_streak = 0
+    while mask:
+        mask &= mask >> 1
+        longest_streak += 1
+    
+    return current_streak, longest_streak
+
 async def calculate_user_streak(user_id: str) -> dict:
     """Calculate ride streak for a user"""
     # Get all completed rides/requests for user in last 60 days
-    sixty_days_ago = datetime.now(timezone.utc) - timedelta(days=60)
-    
-    # Get ride dates as driver
-    driver_rides = await db.rides.find({
-        "driver_id": user_id,
-        "status": "completed",
-        "departure_time": {"$gte": sixty_days_ago}
-    }).to_list(1000)
-    
-    # Get ride dates as rider
-    rider_requests = await db.ride_requests.find({
-        "rider_id": user_id,
-        "status": "accepted"
-    }).to_list(1000)
-    
-    ride_dates = set()
+    now = datetime.now(timezone.utc)
+    sixty_days_ago = now - timedelta(days=60)
     
-    for ride in driver_rides:
-        ride_dates.add(ride["departure_time"].date())
+    # Ride dates as driver, and as rider with the ride joined in by MongoDB
+    driver_rides, rider_cursor = await asyncio.gather(
+        db.rides.find({
+            "driver_id": user_id,
+            "status": "completed",
+            "departure_time": {"$gte": sixty_days_ago}
+        }, {"_id": 0, "departure_time": 1}).to_list(1000),
+        db.ride_requests.aggregate([
+            {"$match": {"rider_id": user_id, "status": "accepted"}},
+            {"$lookup": {"from": "rides", "localField": "ride_id", "foreignField": "id", "as": "ride"}},
+            {"$unwind": "$ride"},
+            {"$match": {"ride.status": "completed", "ride.departure_time": {"$gte": sixty_days_ago}}},
+            {"$project": {"_id": 0, "departure_time": "$ride.departure_time"}}
+        ])
+    )
+    rider_rides = await rider_cursor.to_list(1000)
     
-    for req in rider_requests:
-        ride = await db.rides.find_one({"id": req["ride_id"], "status": "completed"})
-        if ride and ride["departure_time"] >= sixty_days_ago:
-            ride_dates.add(ride["departure_time"].date())
+    ride_dates = {ride["departure_time"].date() for ride in driver_rides + rider_rides}
     
     if not ride_dates:
         return {"currentStreak": 0, "longestStreak": 0}
     
-    sorted_dates = sorted(ride_dates, reverse=True)
-    today = datetime.now(timezone.utc).date()
-    
-    # Calculate current streak
-    current_streak = 0
-    check_date = today
-    
-    for i in range(60):
-        if check_date in sorted_dates:
-            current_streak += 1
-            check_date -= timedelta(days=1)
-        elif i == 0:
-            # If no ride today, check yesterday
-            check_date -= timedelta(days=1)
-            if check_date in sorted_dates:
-                current_streak += 1
-                check_date -= timedelta(days=1)
-            else:
-                break
-        else:
-            break
-    
-    # Calculate longest streak
-    longest_streak = 0
-    current_count = 1
-    
-    for i in range(1, len(sorted_dates)):
-        diff = (sorted_dates[i-1] - sorted_dates[i]).days
-        if diff == 1:
-            current_count += 1
-        else:
-            longest_streak = max(longest_streak, current_count)
-            current_count = 1
-    
-    longest_streak = max(longest_streak, current_count)
+    current_streak, longest_streak = count_streaks(ride_dates, now.date())
     
     return {
         "currentStreak": current_streak,
         "longestStreak": longest_streak
     }
 
-async def get_user_badges(user_id: str) -> List[dict]:
-    """Calculate earned badges for a user"""
-    stats = await calculate_user_statistics(user_id)
-    streak = await calculate_user_streak(user_id)
+async def get_user_badges(user_id: str, stats: Optional[dict] = None, streak: Optional[dict] = None) -> List[dict]:
+    """Calculate earned badges for a user, reusing stats and streak when the caller has both.
+    
+    Without them, recently computed badges are served from badge_cache instead.
+    """
+    if stats is None and streak is None:
+        cached = badge_cache.get(user_id)
+        if cached and cached[1] > time.time():
+            badge_cache.move_to_end(user_id)
+            return cached[0]
+    if stats is None or streak is None:
+        stats, streak = await asyncio.gather(
+            calculate_user_statistics(user_id),
+            calculate_user_streak(user_id)
+        )
     
-    earned_badges = []
+    metrics = {
+        "rides": stats.get("totalRides", 0),
+        "eco": stats.get("co2SavedKg", 0),
+        "streak": streak.get("longestStreak", 0),
+        "savings": stats.get("moneySaved", 0)
+    }
+    earned_at = datetime.now(timezone.utc).isoformat()
     
-    for badge in BADGE_DEFINITIONS:
-        earned = False
-        badge_type = badge.get("type", "rides")
-        
-        if badge_type == "eco":
-            if stats.get("co2SavedKg", 0) >= badge["requirement"]:
-                earned = True
-        elif badge_type == "streak":
-            if streak.get("longestStreak", 0) >= badge["requirement"]:
-                earned = True
-        elif badge_type == "savings":
-            if stats.get("moneySaved", 0) >= badge["requirement"]:
-                earned = True
-        else:
-            # Default: rides count
-            if stats.get("totalRides", 0) >= badge["requirement"]:
-                earned = True
-        
-        if earned:
-            earned_badges.append({
-                "id": badge["id"],
-                "name": badge["name"],
-                "description": badge["description"],
-                "icon": badge["icon"],
-                "earnedAt": datetime.now(timezone.utc).isoformat()
-            })
+    earned_badges = []
+    for badge_type in BADGE_TYPES:
+        earned_count = bisect.bisect_right(BADGE_THRESHOLDS[badge_type], metrics[badge_type])
+        earned_badges.extend(
+            {**badge, "earnedAt": earned_at} for badge in BADGE_SUMMARIES[badge_type][:earned_count]
+        )
     
+    badge_cache[user_id] = (earned_badges, time.time() + BADGE_CACHE_TTL_SECONDS)
+    badge_cache.move_to_end(user_id)
+    if len(badge_cache) > BADGE_CACHE_MAX_SIZE:
+        badge_cache.popitem(last=False)
     return earned_badges
 
 async def get_weekly_summary(user_id: str) -> dict:
     """Get weekly summary for a user"""
-    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    
-    # Rides as driver this week
-    driver_rides = await db.rides.find({
-        "driver_id": user_id,
-        "status": "completed",
-        "departure_time": {"$gte": seven_days_ago}
-    }).to_list(100)
-    
-    # Rides as rider this week
-    rider_requests = await db.ride_requests.find({
-        "rider_id": user_id,
-        "status": "accepted"
-    }).to_list(100)
+    now = datetime.now(timezone.utc)
+    seven_days_ago = now - timedelta(days=7)
+    
+    # Rides as driver this week, and rides taken as rider this week with the
+    # ride and its accepted riders joined in by MongoDB for the cost split
+    driver_rides, rider_cursor = await asyncio.gather(
+        db.rides.find({
+            "driver_id": user_id,
+            "status": "completed",
+            "departure_time": {"$gte": seven_days_ago}
+        }, {"_id": 0, "distance_km": 1}).to_list(100),
+        db.ride_requests.aggregate([
+            {"$match": {"rider_id": user_id, "status": "accepted"}},
+            {"$lookup": {"from": "rides", "localField": "ride_id", "foreignField": "id", "as": "ride"}},
+            {"$unwind": "$ride"},
+            {"$match": {"ride.status": "completed", "ride.departure_time": {"$gte": seven_days_ago}}},
+            {"$lookup": {"from": "ride_requests", "localField": "ride_id", "foreignField": "ride_id", "as": "ride_requests"}},
+            {"$project": {
+                "_id": 0,
+                "distance_km": "$ride.distance_km",
+                "estimated_cost": "$ride.estimated_cost",
+                "accepted_count": {"$size": {"$filter": {
+                    "input": "$ride_requests",
+                    "cond": {"$eq": ["$$this.status", "accepted"]}
+                }}}
+            }}
+        ])
+    )
+    rider_rides = await rider_cursor.to_list(100)
     
-    weekly_rides_taken = 0
+    weekly_rides_taken = len(rider_rides)
     weekly_distance = 0
     weekly_cost = 0
     
     for ride in driver_rides:
         weekly_distance += ride.get("distance_km", AVERAGE_RIDE_DISTANCE_KM)
     
-    for req in rider_requests:
-        ride = await db.rides.find_one({
-            "id": req["ride_id"],
-            "status": "completed",
-            "departure_time": {"$gte": seven_days_ago}
-        })
-        if ride:
-            weekly_rides_taken += 1
-            weekly_distance += ride.get("distance_km", AVERAGE_RIDE_DISTANCE_KM)
-            accepted_count = await db.ride_requests.count_documents({"ride_id": ride["id"], "status": "accepted"})
-            weekly_cost += ride["estimated_cost"] / max(accepted_count, 1)
+    for ride in rider_rides:
+        weekly_distance += ride.get("distance_km", AVERAGE_RIDE_DISTANCE_KM)
+        weekly_cost += ride["estimated_cost"] / max(ride["accepted_count"], 1)
     
     weekly_rides_offered = len(driver_rides)
     solo_cost = weekly_distance * COST_PER_KM * 2
@@ -584,7 +1028,7 @@ async def get_weekly_summary(user_id: str) -> dict:
         "moneySaved": round(weekly_money_saved, 2),
         "co2SavedKg": round(weekly_co2_saved, 2),
         "periodStart": seven_days_ago.isoformat(),
-        "periodEnd": datetime.now(timezone.utc).isoformat()
+        "periodEnd": now.isoformat()
     }
 
 # API Routes
@@ -594,22 +1038,25 @@ async def health_check():
     return {"status": "healthy", "service": "CampusPool API"}
 
 @app.get("/api/pickup-points")
-async def get_pickup_points():
-    return {"pickup_points": PICKUP_POINTS}
+async def get_pickup_points(if_none_match: Optional[str] = Header(None)):
+    return cached_json_response(PICKUP_POINTS_JSON, PICKUP_POINTS_ETAG, STATIC_CACHE_CONTROL, if_none_match)
 
 @app.get("/api/event-tags")
-async def get_event_tags():
+async def get_event_tags(if_none_match: Optional[str] = Header(None)):
     """Get all available event tags"""
+    global event_tags_body_cache
     # Get custom event tags from database
-    custom_tags = await db.custom_events.find({}).to_list(100)
-    custom_formatted = [
-        {"id": t["id"], "name": t["name"], "icon": t["icon"], "color": t["color"]}
-        for t in custom_tags
-    ]
-    return {"event_tags": EVENT_TAGS + custom_formatted}
+    custom_tags = await get_custom_event_tags()
+    # Re-encode only when the custom tag cache has been reloaded
+    if event_tags_body_cache is None or event_tags_body_cache[0] is not custom_tags:
+        custom_formatted = list(custom_tags.values())
+        body = encode_static_json({"event_tags": EVENT_TAGS + custom_formatted})
+        event_tags_body_cache = (custom_tags, body, json_etag(body))
+    _, body, etag = event_tags_body_cache
+    return cached_json_response(body, etag, EVENT_TAGS_CACHE_CONTROL, if_none_match)
 
 @app.post("/api/event-tags")
-async def create_event_tag(tag_data: EventTagCreate, user: dict = Depends(get_current_user)):
+async def create_event_tag(tag_data: EventTagCreate, background_tasks: BackgroundTasks, user: dict = Depends(get_current_user)):
     """Create a custom event tag (admin only)"""
     if user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Only admins can create event tags")
@@ -624,10 +1071,13 @@ async def create_event_tag(tag_data: EventTagCreate, user: dict = Depends(get_cu
         "created_at": datetime.now(timezone.utc)
     }
     
-    await db.custom_events.insert_one(new_tag)
+    # PyMongo adds an ObjectId _id to the inserted dict; insert a copy so it stays out of the response
+    await db.custom_events.insert_one(dict(new_tag))
+    invalidate_custom_event_tags()
     
     # Log admin action
-    await log_admin_action(
+    background_tasks.add_task(
+        log_admin_action,
         user["id"], user["name"], "create_event_tag", "event_tag", tag_id,
         f"Created event tag: {tag_data.name}"
     )
@@ -635,25 +1085,19 @@ async def create_event_tag(tag_data: EventTagCreate, user: dict = Depends(get_cu
     return {"message": "Event tag created", "tag": new_tag}
 
 @app.get("/api/academic-options")
-async def get_academic_options():
+async def get_academic_options(if_none_match: Optional[str] = Header(None)):
     """Get available branches and academic years"""
-    return {
-        "branches": ACADEMIC_BRANCHES,
-        "academic_years": ACADEMIC_YEARS
-    }
+    return cached_json_response(ACADEMIC_OPTIONS_JSON, ACADEMIC_OPTIONS_ETAG, STATIC_CACHE_CONTROL, if_none_match)
 
 # Auth Routes
 @app.post("/api/auth/signup", response_model=TokenResponse)
 async def signup(user_data: UserSignup):
-    existing = await db.users.find_one({"email": user_data.email})
-    if existing:
-        raise HTTPException(status_code=409, detail="Email already registered")
-    
+    now = datetime.now(timezone.utc)
     user_id = str(uuid.uuid4())
     user = {
         "id": user_id,
         "email": user_data.email,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await hash_password(user_data.password),
         "name": user_data.name,
         "role": user_data.role,
         "branch": user_data.branch,
@@ -662,11 +1106,16 @@ async def signup(user_data: UserSignup):
         "is_disabled": False,
         "is_suspended": False,
         "warnings": [],
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
     
-    await db.users.insert_one(user)
+    # The unique email index rejects duplicates, including concurrent signups
+    # that a separate existence check would let through
+    try:
+        await db.users.insert_one(user)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Email already registered")
     token = create_token(user_id)
     
     return {
@@ -682,15 +1131,19 @@ async def signup(user_data: UserSignup):
     }
 
 @app.post("/api/auth/login", response_model=TokenResponse)
-async def login(credentials: UserLogin):
-    user = await db.users.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+async def login(credentials: UserLogin, background_tasks: BackgroundTasks):
+    user = await db.users.find_one({"email": credentials.email}, LOGIN_USER_PROJECTION)
+    if not user or not await verify_password(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Check if user is disabled
     if user.get("is_disabled", False):
         raise HTTPException(status_code=403, detail="Your account has been disabled. Contact support.")
     
+    # Move hashes made before a BCRYPT_ROUNDS change onto the current cost
+    if password_needs_rehash(user["password_hash"]):
+        background_tasks.add_task(rehash_password, user["id"], credentials.password, user["password_hash"])
+    
     token = create_token(user["id"])
     
     return {
@@ -707,10 +1160,12 @@ async def login(credentials: UserLogin):
 
 @app.get("/api/auth/me")
 async def get_current_user_info(user: dict = Depends(get_current_user)):
-    trust_info = await get_user_trust_info(user["id"])
-    stats = await calculate_user_statistics(user["id"])
-    streak = await calculate_user_streak(user["id"])
-    badges = await get_user_badges(user["id"])
+    trust_info, stats, streak = await asyncio.gather(
+        get_user_trust_info(user["id"]),
+        calculate_user_statistics(user["id"]),
+        calculate_user_streak(user["id"])
+    )
+    badges = await get_user_badges(user["id"], stats=stats, streak=streak)
     
     return {
         "id": user["id"],
@@ -736,29 +1191,36 @@ async def update_profile(profile_data: UserProfileUpdate, user: dict = Depends(g
     if profile_data.name:
         update_fields["name"] = profile_data.name
     if profile_data.branch:
-        if profile_data.branch not in ACADEMIC_BRANCHES:
+        if profile_data.branch not in VALID_ACADEMIC_BRANCHES:
             raise HTTPException(status_code=400, detail="Invalid branch")
         update_fields["branch"] = profile_data.branch
     if profile_data.academic_year:
-        if profile_data.academic_year not in ACADEMIC_YEARS:
+        if profile_data.academic_year not in VALID_ACADEMIC_YEARS:
             raise HTTPException(status_code=400, detail="Invalid academic year")
         update_fields["academic_year"] = profile_data.academic_year
     
+    # Skip the write entirely when the submitted values match the stored ones
+    update_fields = {k: v for k, v in update_fields.items() if user.get(k) != v}
+    
     if update_fields:
         update_fields["updated_at"] = datetime.now(timezone.utc)
         await db.users.update_one({"id": user["id"]}, {"$set": update_fields})
+        invalidate_cached_user(user["id"])
     
     return {"message": "Profile updated successfully"}
 
 # User Profile Routes
 @app.get("/api/users/{user_id}/profile")
 async def get_user_profile(user_id: str, current_user: dict = Depends(get_current_user)):
-    user = await db.users.find_one({"id": user_id})
+    user = await db.users.find_one({"id": user_id}, PUBLIC_PROFILE_PROJECTION)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    trust_info = await get_user_trust_info(user_id)
-    badges = await get_user_badges(user_id)
+    # Badges come from the short-lived badge cache when this profile was seen recently
+    trust_info, badges = await asyncio.gather(
+        get_user_trust_info(user_id),
+        get_user_badges(user_id)
+    )
     
     # Check for mutual academic details
     mutual_info = {}
@@ -787,10 +1249,12 @@ async def get_user_profile(user_id: str, current_user: dict = Depends(get_curren
 @app.get("/api/users/me/statistics")
 async def get_my_statistics(user: dict = Depends(get_current_user)):
     """Get detailed statistics for current user"""
-    stats = await calculate_user_statistics(user["id"])
-    streak = await calculate_user_streak(user["id"])
-    weekly = await get_weekly_summary(user["id"])
-    badges = await get_user_badges(user["id"])
+    stats, streak, weekly = await asyncio.gather(
+        calculate_user_statistics(user["id"]),
+        calculate_user_streak(user["id"]),
+        get_weekly_summary(user["id"])
+    )
+    badges = await get_user_badges(user["id"], stats=stats, streak=streak)
     
     return {
         "statistics": stats,
@@ -831,17 +1295,24 @@ async def create_ride(ride_data: RideCreate, user: dict = Depends(get_current_us
     if user["role"] != "driver":
         raise HTTPException(status_code=403, detail="Only drivers can post rides")
     
-    if ride_data.pickup_point and ride_data.pickup_point not in PICKUP_POINTS:
+    if ride_data.pickup_point and ride_data.pickup_point not in VALID_PICKUP_POINTS:
         raise HTTPException(status_code=400, detail="Invalid pickup point")
     
-    # Validate event tag if provided
-    if ride_data.event_tag:
-        valid_tags = [t["id"] for t in EVENT_TAGS]
-        custom_tags = await db.custom_events.find({}).to_list(100)
-        valid_tags.extend([t["id"] for t in custom_tags])
-        if ride_data.event_tag not in valid_tags:
+    if ride_data.recurrence_pattern and ride_data.recurrence_pattern not in RECURRENCE_OFFSETS:
+        raise HTTPException(status_code=400, detail="Invalid recurrence pattern")
+    
+    # Validate event tag if provided; the cached custom tags answer most lookups, and
+    # the database is only asked about tags created since (e.g. by another worker)
+    if (
+        ride_data.event_tag
+        and ride_data.event_tag not in EVENT_TAGS_BY_ID
+        and ride_data.event_tag not in await get_custom_event_tags()
+    ):
+        custom_tag = await db.custom_events.find_one({"id": ride_data.event_tag}, {"_id": 1})
+        if not custom_tag:
             raise HTTPException(status_code=400, detail="Invalid event tag")
     
+    now = datetime.now(timezone.utc)
     ride_id = str(uuid.uuid4())
     ride = {
         "id": ride_id,
@@ -862,20 +1333,23 @@ async def create_ride(ride_data: RideCreate, user: dict = Depends(get_current_us
         "event_tag": ride_data.event_tag,
         "distance_km": ride_data.distance_km or AVERAGE_RIDE_DISTANCE_KM,
         "status": "posted",
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
     
-    await db.rides.insert_one(ride)
-    
-    recurring_count = 0
+    recurring_rides = []
     if ride_data.is_recurring and ride_data.recurrence_pattern:
-        recurring_count = await generate_recurring_rides(ride, user["id"], ride_data.recurrence_pattern)
+        recurring_rides = generate_recurring_rides(ride, ride_data.recurrence_pattern)
+    
+    # Parent and recurring rides go out in a single batch. PyMongo adds an
+    # ObjectId _id to the inserted dict; insert a copy so it stays out of the response.
+    # Each ride has a fresh uuid id, so nothing collides and insertion order doesn't matter
+    await db.rides.insert_many([dict(ride)] + recurring_rides, ordered=False)
     
     return {
         "message": "Ride posted successfully",
         "ride": ride,
-        "recurring_rides_created": recurring_count
+        "recurring_rides_created": len(recurring_rides)
     }
 
 @app.get("/api/rides")
@@ -887,8 +1361,8 @@ async def get_rides(
     event_tag: Optional[str] = None,
     branch: Optional[str] = None,
     academic_year: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     query = {
         "status": "posted",
@@ -920,43 +1394,43 @@ async def get_rides(
     if academic_year:
         query["driver_year"] = academic_year
     
-    cursor = db.rides.find(query).sort("departure_time", 1).skip(offset).limit(limit)
-    rides = await cursor.to_list(length=limit)
-    
     if source or destination:
-        for ride in rides:
-            ride["recommendation_score"] = calculate_route_similarity(
-                ride["source"], ride["destination"],
-                source or "", destination or ""
-            )
-        rides.sort(key=lambda x: (-x.get("recommendation_score", 0), x["departure_time"]))
+        # Score and rank in MongoDB so the best matches lead across all pages,
+        # not just within the page that happened to be fetched
+        score_terms = []
+        if source:
+            score_terms.append(route_similarity_expression("source", source))
+        if destination:
+            score_terms.append(route_similarity_expression("destination", destination))
+        cursor = await db.rides.aggregate([
+            {"$match": query},
+            {"$project": RIDE_VIEW_PROJECTION},
+            {"$addFields": {"recommendation_score": {"$add": score_terms}}},
+            {"$sort": {"recommendation_score": -1, "departure_time": 1}},
+            {"$skip": offset},
+            {"$limit": limit}
+        ], batchSize=limit)
+        rides = await cursor.to_list(length=limit)
     else:
+        cursor = db.rides.find(query, RIDE_VIEW_PROJECTION).sort("departure_time", 1).skip(offset).limit(limit).batch_size(limit)
+        rides = await cursor.to_list(length=limit)
         for ride in rides:
             ride["recommendation_score"] = 0
     
     # Get event tag info
-    all_tags = {t["id"]: t for t in EVENT_TAGS}
-    custom_tags = await db.custom_events.find({}).to_list(100)
-    for t in custom_tags:
-        all_tags[t["id"]] = t
+    all_tags = await get_all_event_tags()
+    
+    trust_by_driver = await get_users_trust_info([ride["driver_id"] for ride in rides])
     
     formatted_rides = []
     for ride in rides:
         occupied = ride["total_seats"] - ride["available_seats"]
         cost_per_rider = ride["estimated_cost"] / max(occupied, 1)
         
-        driver_trust = await get_user_trust_info(ride["driver_id"])
+        driver_trust = trust_by_driver[ride["driver_id"]]
         
-        event_info = None
-        if ride.get("event_tag"):
-            tag_data = all_tags.get(ride["event_tag"])
-            if tag_data:
-                event_info = {
-                    "id": tag_data["id"],
-                    "name": tag_data["name"],
-                    "icon": tag_data["icon"],
-                    "color": tag_data["color"]
-                }
+        # Tag entries already hold exactly id, name, icon and color
+        event_info = all_tags.get(ride["event_tag"]) if ride.get("event_tag") else None
         
         formatted_rides.append({
             "id": ride["id"],
@@ -982,15 +1456,16 @@ async def get_rides(
             "isRecommended": ride.get("recommendation_score", 0) >= 25
         })
     
-    return {
+    # The payload is already JSON-native, so skip FastAPI's jsonable_encoder pass
+    return CoreJSONResponse({
         "message": "Rides retrieved successfully",
         "rides": formatted_rides,
         "total": len(formatted_rides)
-    }
+    })
 
 @app.get("/api/rides/{ride_id}")
 async def get_ride(ride_id: str):
-    ride = await db.rides.find_one({"id": ride_id})
+    ride = await db.rides.find_one({"id": ride_id}, RIDE_VIEW_PROJECTION)
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
@@ -999,37 +1474,30 @@ async def get_ride(ride_id: str):
     
     driver_trust = await get_user_trust_info(ride["driver_id"])
     
-    safe_completion = await db.safe_completions.find_one({"ride_id": ride_id})
+    safe_completion = await db.safe_completions.find_one(
+        {"ride_id": ride_id},
+        {"_id": 0, "confirmed_at": 1, "confirmed_by": 1}
+    )
     
     accepted_requests = await db.ride_requests.find({
         "ride_id": ride_id,
         "status": "accepted"
-    }).to_list(100)
+    }, {"_id": 0, "rider_id": 1, "rider_name": 1}).to_list(100)
     
+    trust_by_rider = await get_users_trust_info([req["rider_id"] for req in accepted_requests])
     riders = []
     for req in accepted_requests:
-        rider_trust = await get_user_trust_info(req["rider_id"])
         riders.append({
             "id": req["rider_id"],
             "name": req["rider_name"],
-            "trust": rider_trust
+            "trust": trust_by_rider[req["rider_id"]]
         })
     
     # Get event tag info
     event_info = None
     if ride.get("event_tag"):
-        all_tags = {t["id"]: t for t in EVENT_TAGS}
-        custom_tags = await db.custom_events.find({}).to_list(100)
-        for t in custom_tags:
-            all_tags[t["id"]] = t
-        tag_data = all_tags.get(ride["event_tag"])
-        if tag_data:
-            event_info = {
-                "id": tag_data["id"],
-                "name": tag_data["name"],
-                "icon": tag_data["icon"],
-                "color": tag_data["color"]
-            }
+        # Tag entries already hold exactly id, name, icon and color
+        event_info = (await get_all_event_tags()).get(ride["event_tag"])
     
     return {
         "id": ride["id"],
@@ -1066,49 +1534,38 @@ async def get_driver_rides(authorization: str = None):
     if user["role"] != "driver":
         raise HTTPException(status_code=403, detail="Only drivers can access this")
     
-    cursor = db.rides.find({"driver_id": user["id"]}).sort("departure_time", -1)
+    cursor = db.rides.find({"driver_id": user["id"]}, RIDE_VIEW_PROJECTION).sort("departure_time", -1).limit(100)
     rides = await cursor.to_list(length=100)
     
-    # Get event tags
-    all_tags = {t["id"]: t for t in EVENT_TAGS}
-    custom_tags = await db.custom_events.find({}).to_list(100)
-    for t in custom_tags:
-        all_tags[t["id"]] = t
+    # Accepted riders of the completed rides and the driver's ratings for them, one query each
+    completed_ids = [ride["id"] for ride in rides if ride["status"] == "completed"]
+    all_tags, accepted_requests, rated = await asyncio.gather(
+        get_all_event_tags(),
+        db.ride_requests.find(
+            {"ride_id": {"$in": completed_ids}, "status": "accepted"},
+            {"_id": 0, "ride_id": 1, "rider_id": 1, "rider_name": 1}
+        ).to_list(None),
+        db.ratings.find(
+            {"rater_id": user["id"], "ride_id": {"$in": completed_ids}},
+            {"_id": 0, "ride_id": 1, "rated_user_id": 1}
+        ).to_list(None)
+    )
+    rated_pairs = {(r["ride_id"], r["rated_user_id"]) for r in rated}
+    pending_by_ride = {}
+    for req in accepted_requests:
+        if (req["ride_id"], req["rider_id"]) not in rated_pairs:
+            pending_by_ride.setdefault(req["ride_id"], []).append({
+                "userId": req["rider_id"],
+                "userName": req["rider_name"]
+            })
     
     formatted_rides = []
     for ride in rides:
         occupied = ride["total_seats"] - ride["available_seats"]
         cost_per_rider = ride["estimated_cost"] / max(occupied, 1)
         
-        pending_ratings = []
-        if ride["status"] == "completed":
-            accepted_requests = await db.ride_requests.find({
-                "ride_id": ride["id"],
-                "status": "accepted"
-            }).to_list(100)
-            
-            for req in accepted_requests:
-                existing_rating = await db.ratings.find_one({
-                    "ride_id": ride["id"],
-                    "rater_id": user["id"],
-                    "rated_user_id": req["rider_id"]
-                })
-                if not existing_rating:
-                    pending_ratings.append({
-                        "userId": req["rider_id"],
-                        "userName": req["rider_name"]
-                    })
-        
-        event_info = None
-        if ride.get("event_tag"):
-            tag_data = all_tags.get(ride["event_tag"])
-            if tag_data:
-                event_info = {
-                    "id": tag_data["id"],
-                    "name": tag_data["name"],
-                    "icon": tag_data["icon"],
-                    "color": tag_data["color"]
-                }
+        # Tag entries already hold exactly id, name, icon and color
+        event_info = all_tags.get(ride["event_tag"]) if ride.get("event_tag") else None
         
         formatted_rides.append({
             "id": ride["id"],
@@ -1127,23 +1584,23 @@ async def get_driver_rides(authorization: str = None):
             "eventTag": event_info,
             "distanceKm": ride.get("distance_km", AVERAGE_RIDE_DISTANCE_KM),
             "status": ride["status"],
-            "pendingRatings": pending_ratings
+            "pendingRatings": pending_by_ride.get(ride["id"], [])
         })
     
-    return {"rides": formatted_rides}
+    return CoreJSONResponse({"rides": formatted_rides})
 
 @app.patch("/api/rides/{ride_id}/status")
 async def update_ride_status(ride_id: str, status: str, authorization: str = None):
     user = await get_current_user(authorization)
     
-    ride = await db.rides.find_one({"id": ride_id})
+    ride = await db.rides.find_one({"id": ride_id}, {"_id": 0, "driver_id": 1})
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
     if ride["driver_id"] != user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    if status not in ["posted", "in_progress", "completed", "cancelled"]:
+    if status not in RIDE_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
     
     await db.rides.update_one(
@@ -1161,25 +1618,32 @@ async def create_ride_request(request_data: RideRequestCreate, authorization: st
     if user["role"] != "rider":
         raise HTTPException(status_code=403, detail="Only riders can request rides")
     
-    ride = await db.rides.find_one({"id": request_data.ride_id})
+    # The ride and any earlier request by this rider are independent reads
+    ride, existing = await asyncio.gather(
+        db.rides.find_one(
+            {"id": request_data.ride_id},
+            {"_id": 0, "available_seats": 1, "departure_time": 1}
+        ),
+        db.ride_requests.find_one(
+            {"ride_id": request_data.ride_id, "rider_id": user["id"]},
+            {"_id": 1}
+        )
+    )
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
     if ride["available_seats"] <= 0:
         raise HTTPException(status_code=400, detail="No available seats")
     
+    now = datetime.now(timezone.utc)
     if request_data.is_urgent:
-        time_until_departure = (ride["departure_time"] - datetime.now(timezone.utc)).total_seconds() / 3600
+        time_until_departure = (ride["departure_time"] - now).total_seconds() / 3600
         if time_until_departure > 2:
             raise HTTPException(
                 status_code=400, 
                 detail="Urgent requests are only allowed for rides departing within 2 hours"
             )
     
-    existing = await db.ride_requests.find_one({
-        "ride_id": request_data.ride_id,
-        "rider_id": user["id"]
-    })
     if existing:
         raise HTTPException(status_code=409, detail="You already requested this ride")
     
@@ -1193,8 +1657,8 @@ async def create_ride_request(request_data: RideRequestCreate, authorization: st
         "rider_year": user.get("academic_year"),
         "is_urgent": request_data.is_urgent,
         "status": "pending",
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
     
     await db.ride_requests.insert_one(ride_request)
@@ -1215,22 +1679,30 @@ async def create_ride_request(request_data: RideRequestCreate, authorization: st
 async def get_ride_requests(ride_id: str, authorization: str = None):
     user = await get_current_user(authorization)
     
-    ride = await db.rides.find_one({"id": ride_id})
+    ride = await db.rides.find_one({"id": ride_id}, {"_id": 0, "driver_id": 1})
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
     if ride["driver_id"] != user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    cursor = db.ride_requests.find({"ride_id": ride_id}).sort([
+    cursor = db.ride_requests.find({"ride_id": ride_id}, {
+        "_id": 0,
+        **dict.fromkeys([
+            "id", "ride_id", "rider_id", "rider_name", "rider_branch", "rider_year",
+            "is_urgent", "status", "created_at"
+        ], 1)
+    }).sort([
         ("is_urgent", -1),
         ("created_at", 1)
-    ])
+    ]).limit(100)
     requests = await cursor.to_list(length=100)
     
+    trust_by_rider = await get_users_trust_info([req["rider_id"] for req in requests])
+    
     result = []
     for req in requests:
-        rider_trust = await get_user_trust_info(req["rider_id"])
+        rider_trust = trust_by_rider[req["rider_id"]]
         result.append({
             "id": req["id"],
             "rideId": req["ride_id"],
@@ -1244,37 +1716,46 @@ async def get_ride_requests(ride_id: str, authorization: str = None):
             "createdAt": req["created_at"].isoformat()
         })
     
-    return {"requests": result}
+    return CoreJSONResponse({"requests": result})
 
 @app.get("/api/requests/my-requests")
 async def get_my_requests(authorization: str = None):
     user = await get_current_user(authorization)
     
-    cursor = db.ride_requests.find({"rider_id": user["id"]}).sort("created_at", -1)
+    cursor = db.ride_requests.find(
+        {"rider_id": user["id"]},
+        {"_id": 0, "id": 1, "ride_id": 1, "is_urgent": 1, "status": 1, "created_at": 1}
+    ).sort("created_at", -1).limit(100)
     requests = await cursor.to_list(length=100)
     
+    # Rides, this rider's ratings and safe completions for the page, one query each
+    ride_ids = list({req["ride_id"] for req in requests})
+    rides_by_id, rated, confirmed_ride_ids = await asyncio.gather(
+        get_rides_by_id(ride_ids, [
+            "source", "destination", "departure_time", "driver_name",
+            "driver_id", "pickup_point", "status", "estimated_cost"
+        ]),
+        db.ratings.find(
+            {"rater_id": user["id"], "ride_id": {"$in": ride_ids}},
+            {"_id": 0, "ride_id": 1, "rated_user_id": 1}
+        ).to_list(None),
+        db.safe_completions.distinct("ride_id", {"ride_id": {"$in": ride_ids}, "confirmed_by": user["id"]})
+    )
+    rated_pairs = {(r["ride_id"], r["rated_user_id"]) for r in rated}
+    confirmed_ride_ids = set(confirmed_ride_ids)
+    
     result = []
     for req in requests:
-        ride = await db.rides.find_one({"id": req["ride_id"]})
+        ride = rides_by_id.get(req["ride_id"])
         if ride:
             pending_rating = None
             if req["status"] == "accepted" and ride["status"] == "completed":
-                existing_rating = await db.ratings.find_one({
-                    "ride_id": ride["id"],
-                    "rater_id": user["id"],
-                    "rated_user_id": ride["driver_id"]
-                })
-                if not existing_rating:
+                if (ride["id"], ride["driver_id"]) not in rated_pairs:
                     pending_rating = {
                         "userId": ride["driver_id"],
                         "userName": ride["driver_name"]
                     }
             
-            safe_completion = await db.safe_completions.find_one({
-                "ride_id": ride["id"],
-                "confirmed_by": user["id"]
-            })
-            
             result.append({
                 "id": req["id"],
                 "rideId": req["ride_id"],
@@ -1292,35 +1773,47 @@ async def get_my_requests(authorization: str = None):
                     "estimatedCost": ride["estimated_cost"]
                 },
                 "pendingRating": pending_rating,
-                "safelyConfirmed": safe_completion is not None
+                "safelyConfirmed": ride["id"] in confirmed_ride_ids
             })
     
-    return {"requests": result}
+    return CoreJSONResponse({"requests": result})
 
 @app.patch("/api/requests/{request_id}/accept")
 async def accept_request(request_id: str, authorization: str = None):
     user = await get_current_user(authorization)
     
-    request = await db.ride_requests.find_one({"id": request_id})
+    request = await get_request_with_driver(request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
-    ride = await db.rides.find_one({"id": request["ride_id"]})
-    if ride["driver_id"] != user["id"]:
+    if request.get("driver_id") != user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    if ride["available_seats"] <= 0:
-        raise HTTPException(status_code=400, detail="No available seats")
+    if request.get("status") == "accepted":
+        raise HTTPException(status_code=409, detail="Request already accepted")
     
-    await db.ride_requests.update_one(
-        {"id": request_id},
-        {"$set": {"status": "accepted", "updated_at": datetime.now(timezone.utc)}}
+    now = datetime.now(timezone.utc)
+    
+    # Claim the seat first so a request is never accepted without one; a
+    # standalone mongod has no transactions, so if the flip below loses a
+    # concurrent accept the seat is handed back
+    seat = await db.rides.update_one(
+        {"id": request["ride_id"], "available_seats": {"$gt": 0}},
+        {"$inc": {"available_seats": -1}, "$set": {"updated_at": now}}
     )
+    if seat.modified_count == 0:
+        raise HTTPException(status_code=400, detail="No available seats")
     
-    await db.rides.update_one(
-        {"id": request["ride_id"]},
-        {"$inc": {"available_seats": -1}, "$set": {"updated_at": datetime.now(timezone.utc)}}
+    accepted = await db.ride_requests.update_one(
+        {"id": request_id, "status": {"$ne": "accepted"}},
+        {"$set": {"status": "accepted", "updated_at": now}}
     )
+    if accepted.modified_count == 0:
+        await db.rides.update_one(
+            {"id": request["ride_id"]},
+            {"$inc": {"available_seats": 1}}
+        )
+        raise HTTPException(status_code=409, detail="Request already accepted")
     
     return {"message": "Request accepted successfully"}
 
@@ -1328,12 +1821,11 @@ async def accept_request(request_id: str, authorization: str = None):
 async def reject_request(request_id: str, authorization: str = None):
     user = await get_current_user(authorization)
     
-    request = await db.ride_requests.find_one({"id": request_id})
+    request = await get_request_with_driver(request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
-    ride = await db.rides.find_one({"id": request["ride_id"]})
-    if ride["driver_id"] != user["id"]:
+    if request.get("driver_id") != user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     await db.ride_requests.update_one(
@@ -1348,7 +1840,20 @@ async def reject_request(request_id: str, authorization: str = None):
 async def create_rating(rating_data: RatingCreate, authorization: str = None):
     user = await get_current_user(authorization)
     
-    ride = await db.rides.find_one({"id": rating_data.ride_id})
+    # Ride, membership of both parties and any earlier rating: three concurrent reads
+    ride, accepted_riders, existing = await asyncio.gather(
+        db.rides.find_one({"id": rating_data.ride_id}, {"_id": 0, "driver_id": 1, "status": 1}),
+        db.ride_requests.distinct("rider_id", {
+            "ride_id": rating_data.ride_id,
+            "rider_id": {"$in": [user["id"], rating_data.rated_user_id]},
+            "status": "accepted"
+        }),
+        db.ratings.find_one({
+            "ride_id": rating_data.ride_id,
+            "rater_id": user["id"],
+            "rated_user_id": rating_data.rated_user_id
+        }, {"_id": 1})
+    )
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
@@ -1356,21 +1861,13 @@ async def create_rating(rating_data: RatingCreate, authorization: str = None):
         raise HTTPException(status_code=400, detail="Can only rate completed rides")
     
     is_driver = ride["driver_id"] == user["id"]
-    is_rider = await db.ride_requests.find_one({
-        "ride_id": rating_data.ride_id,
-        "rider_id": user["id"],
-        "status": "accepted"
-    })
+    is_rider = user["id"] in accepted_riders
     
     if not is_driver and not is_rider:
         raise HTTPException(status_code=403, detail="You were not part of this ride")
     
     rated_is_driver = ride["driver_id"] == rating_data.rated_user_id
-    rated_is_rider = await db.ride_requests.find_one({
-        "ride_id": rating_data.ride_id,
-        "rider_id": rating_data.rated_user_id,
-        "status": "accepted"
-    })
+    rated_is_rider = rating_data.rated_user_id in accepted_riders
     
     if not rated_is_driver and not rated_is_rider:
         raise HTTPException(status_code=400, detail="Rated user was not part of this ride")
@@ -1378,11 +1875,6 @@ async def create_rating(rating_data: RatingCreate, authorization: str = None):
     if user["id"] == rating_data.rated_user_id:
         raise HTTPException(status_code=400, detail="Cannot rate yourself")
     
-    existing = await db.ratings.find_one({
-        "ride_id": rating_data.ride_id,
-        "rater_id": user["id"],
-        "rated_user_id": rating_data.rated_user_id
-    })
     if existing:
         raise HTTPException(status_code=409, detail="You already rated this user for this ride")
     
@@ -1411,10 +1903,13 @@ async def get_user_ratings(user_id: str):
             "_id": None,
             "avgRating": {"$avg": "$rating"},
             "count": {"$sum": 1},
-            "stars": {"$push": "$rating"}
+            **{
+                f"stars{star}": {"$sum": {"$cond": [{"$eq": ["$rating", star]}, 1, 0]}}
+                for star in range(1, 6)
+            }
         }}
     ]
-    result = await db.ratings.aggregate(pipeline).to_list(1)
+    result = await (await db.ratings.aggregate(pipeline)).to_list(1)
     
     if not result:
         return {
@@ -1423,14 +1918,10 @@ async def get_user_ratings(user_id: str):
             "distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
         }
     
-    distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    for star in result[0]["stars"]:
-        distribution[star] = distribution.get(star, 0) + 1
-    
     return {
         "avgRating": round(result[0]["avgRating"], 1),
         "totalRatings": result[0]["count"],
-        "distribution": distribution
+        "distribution": {star: result[0][f"stars{star}"] for star in range(1, 6)}
     }
 
 # Safe Completion Routes
@@ -1438,22 +1929,25 @@ async def get_user_ratings(user_id: str):
 async def confirm_safe_completion(data: SafeCompletionCreate, authorization: str = None):
     user = await get_current_user(authorization)
     
-    ride = await db.rides.find_one({"id": data.ride_id})
+    # All three checks are independent lookups, so run them together
+    ride, ride_request, existing = await asyncio.gather(
+        db.rides.find_one({"id": data.ride_id}, {"_id": 1}),
+        db.ride_requests.find_one({
+            "ride_id": data.ride_id,
+            "rider_id": user["id"],
+            "status": "accepted"
+        }, {"_id": 1}),
+        db.safe_completions.find_one({
+            "ride_id": data.ride_id,
+            "confirmed_by": user["id"]
+        }, {"_id": 1})
+    )
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
-    ride_request = await db.ride_requests.find_one({
-        "ride_id": data.ride_id,
-        "rider_id": user["id"],
-        "status": "accepted"
-    })
     if not ride_request:
         raise HTTPException(status_code=403, detail="Only accepted riders can confirm safe completion")
     
-    existing = await db.safe_completions.find_one({
-        "ride_id": data.ride_id,
-        "confirmed_by": user["id"]
-    })
     if existing:
         raise HTTPException(status_code=409, detail="You already confirmed safe completion")
     
@@ -1497,20 +1991,29 @@ async def get_driver_history(authorization: str = None):
     cursor = db.rides.find({
         "driver_id": user["id"],
         "status": {"$in": ["completed", "cancelled"]}
-    }).sort("departure_time", -1)
+    }, {
+        "_id": 0,
+        **dict.fromkeys([
+            "id", "source", "destination", "departure_time", "status",
+            "total_seats", "estimated_cost", "distance_km"
+        ], 1)
+    }).sort("departure_time", -1).limit(100)
     rides = await cursor.to_list(length=100)
     
+    ride_ids = [ride["id"] for ride in rides]
+    accepted_counts = await count_accepted_requests(ride_ids)
+    completion_results = await (await db.safe_completions.aggregate([
+        {"$match": {"ride_id": {"$in": ride_ids}}},
+        {"$group": {"_id": "$ride_id", "count": {"$sum": 1}}}
+    ])).to_list(None)
+    completion_counts = {r["_id"]: r["count"] for r in completion_results}
+    
     history = []
     for ride in rides:
-        accepted_requests = await db.ride_requests.find({
-            "ride_id": ride["id"],
-            "status": "accepted"
-        }).to_list(100)
-        
-        riders_count = len(accepted_requests)
+        riders_count = accepted_counts.get(ride["id"], 0)
         actual_cost = ride["estimated_cost"] / max(riders_count, 1) if riders_count > 0 else ride["estimated_cost"]
         
-        safe_completions = await db.safe_completions.count_documents({"ride_id": ride["id"]})
+        safe_completions = completion_counts.get(ride["id"], 0)
         
         history.append({
             "id": ride["id"],
@@ -1527,7 +2030,7 @@ async def get_driver_history(authorization: str = None):
             "role": "driver"
         })
     
-    return {"history": history}
+    return CoreJSONResponse({"history": history})
 
 @app.get("/api/history/rider")
 async def get_rider_history(authorization: str = None):
@@ -1536,23 +2039,32 @@ async def get_rider_history(authorization: str = None):
     cursor = db.ride_requests.find({
         "rider_id": user["id"],
         "status": "accepted"
-    }).sort("created_at", -1)
+    }, {"_id": 0, "ride_id": 1}).sort("created_at", -1).limit(100)
     requests = await cursor.to_list(length=100)
     
+    ride_ids = [req["ride_id"] for req in requests]
+    rides = await db.rides.find({
+        "id": {"$in": ride_ids},
+        "status": {"$in": ["completed", "cancelled"]}
+    }, {
+        "_id": 0,
+        **dict.fromkeys([
+            "id", "source", "destination", "departure_time", "status",
+            "driver_name", "driver_id", "estimated_cost", "distance_km"
+        ], 1)
+    }).to_list(None)
+    rides_by_id = {ride["id"]: ride for ride in rides}
+    accepted_counts = await count_accepted_requests(list(rides_by_id))
+    confirmed_ride_ids = set(await db.safe_completions.distinct("ride_id", {
+        "ride_id": {"$in": list(rides_by_id)},
+        "confirmed_by": user["id"]
+    }))
+    
     history = []
     for req in requests:
-        ride = await db.rides.find_one({"id": req["ride_id"]})
-        if ride and ride["status"] in ["completed", "cancelled"]:
-            accepted_count = await db.ride_requests.count_documents({
-                "ride_id": ride["id"],
-                "status": "accepted"
-            })
-            cost_per_rider = ride["estimated_cost"] / max(accepted_count, 1)
-            
-            safe_completion = await db.safe_completions.find_one({
-                "ride_id": ride["id"],
-                "confirmed_by": user["id"]
-            })
+        ride = rides_by_id.get(req["ride_id"])
+        if ride:
+            cost_per_rider = ride["estimated_cost"] / max(accepted_counts.get(ride["id"], 0), 1)
             
             history.append({
                 "id": ride["id"],
@@ -1563,12 +2075,12 @@ async def get_rider_history(authorization: str = None):
                 "driverName": ride["driver_name"],
                 "driverId": ride["driver_id"],
                 "costPaid": round(cost_per_rider, 2),
-                "safelyConfirmed": safe_completion is not None,
+                "safelyConfirmed": ride["id"] in confirmed_ride_ids,
                 "distanceKm": ride.get("distance_km", AVERAGE_RIDE_DISTANCE_KM),
                 "role": "rider"
             })
     
-    return {"history": history}
+    return CoreJSONResponse({"history": history})
 
 # =============================================================================
 # ADMIN ROUTES - Phase 8: Admin, Moderation & Governance
@@ -1578,21 +2090,26 @@ async def get_rider_history(authorization: str = None):
 @app.post("/api/sos")
 async def create_sos_event(sos_data: SOSEventCreate, user: dict = Depends(get_current_user)):
     """Create an SOS/Emergency event for a ride"""
-    ride = await db.rides.find_one({"id": sos_data.ride_id})
+    # An SOS must not wait on sequential lookups; load the ride and the
+    # caller's accepted request together
+    ride, is_rider = await asyncio.gather(
+        db.rides.find_one({"id": sos_data.ride_id}, {"_id": 0, "driver_id": 1}),
+        db.ride_requests.find_one({
+            "ride_id": sos_data.ride_id,
+            "rider_id": user["id"],
+            "status": "accepted"
+        }, {"_id": 1})
+    )
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
     # Check user is part of the ride
     is_driver = ride["driver_id"] == user["id"]
-    is_rider = await db.ride_requests.find_one({
-        "ride_id": sos_data.ride_id,
-        "rider_id": user["id"],
-        "status": "accepted"
-    })
     
     if not is_driver and not is_rider:
         raise HTTPException(status_code=403, detail="You are not part of this ride")
     
+    now = datetime.now(timezone.utc)
     sos_id = str(uuid.uuid4())
     sos_event = {
         "id": sos_id,
@@ -1603,8 +2120,8 @@ async def create_sos_event(sos_data: SOSEventCreate, user: dict = Depends(get_cu
         "location": sos_data.location,
         "status": "active",
         "admin_notes": [],
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
     
     await db.sos_events.insert_one(sos_event)
@@ -1614,12 +2131,14 @@ async def create_sos_event(sos_data: SOSEventCreate, user: dict = Depends(get_cu
 @app.get("/api/sos/my-events")
 async def get_my_sos_events(user: dict = Depends(get_current_user)):
     """Get SOS events created by the current user"""
-    cursor = db.sos_events.find({"reporter_id": user["id"]}).sort("created_at", -1)
+    cursor = db.sos_events.find({"reporter_id": user["id"]}).sort("created_at", -1).limit(100)
     events = await cursor.to_list(100)
     
+    rides_by_id = await get_rides_by_id([event["ride_id"] for event in events], ["source", "destination"])
+    
     result = []
     for event in events:
-        ride = await db.rides.find_one({"id": event["ride_id"]})
+        ride = rides_by_id.get(event["ride_id"])
         result.append({
             "id": event["id"],
             "rideId": event["ride_id"],
@@ -1633,7 +2152,7 @@ async def get_my_sos_events(user: dict = Depends(get_current_user)):
             } if ride else None
         })
     
-    return {"events": result}
+    return CoreJSONResponse({"events": result})
 
 # --- Report Routes ---
 @app.post("/api/reports")
@@ -1641,14 +2160,15 @@ async def create_report(report_data: ReportCreate, user: dict = Depends(get_curr
     """Submit a report against a user or ride"""
     # Validate target exists
     if report_data.target_type == "user":
-        target = await db.users.find_one({"id": report_data.target_id})
+        target = await db.users.find_one({"id": report_data.target_id}, {"_id": 1})
         if not target:
             raise HTTPException(status_code=404, detail="User not found")
     else:
-        target = await db.rides.find_one({"id": report_data.target_id})
+        target = await db.rides.find_one({"id": report_data.target_id}, {"_id": 1})
         if not target:
             raise HTTPException(status_code=404, detail="Ride not found")
     
+    now = datetime.now(timezone.utc)
     report_id = str(uuid.uuid4())
     report = {
         "id": report_id,
@@ -1662,8 +2182,8 @@ async def create_report(report_data: ReportCreate, user: dict = Depends(get_curr
         "action_taken": None,
         "admin_note": None,
         "reviewed_by": None,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
     
     await db.reports.insert_one(report)
@@ -1673,7 +2193,7 @@ async def create_report(report_data: ReportCreate, user: dict = Depends(get_curr
 @app.get("/api/reports/my-reports")
 async def get_my_reports(user: dict = Depends(get_current_user)):
     """Get reports submitted by the current user"""
-    cursor = db.reports.find({"reporter_id": user["id"]}).sort("created_at", -1)
+    cursor = db.reports.find({"reporter_id": user["id"]}).sort("created_at", -1).limit(100)
     reports = await cursor.to_list(100)
     
     result = []
@@ -1688,7 +2208,7 @@ async def get_my_reports(user: dict = Depends(get_current_user)):
             "createdAt": report["created_at"].isoformat()
         })
     
-    return {"reports": result}
+    return CoreJSONResponse({"reports": result})
 
 # --- Admin User Management Routes ---
 @app.get("/api/admin/users")
@@ -1698,8 +2218,8 @@ async def admin_get_users(
     is_verified: Optional[bool] = None,
     is_disabled: Optional[bool] = None,
     search: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     """Get all users with optional filters (Admin only)"""
     query = {}
@@ -1717,13 +2237,18 @@ async def admin_get_users(
         ]
     
     total = await db.users.count_documents(query)
-    cursor = db.users.find(query).sort("created_at", -1).skip(offset).limit(limit)
+    cursor = db.users.find(query, {"password_hash": 0}).sort("created_at", -1).skip(offset).limit(limit).batch_size(limit)
     users = await cursor.to_list(length=limit)
     
+    user_ids = [user["id"] for user in users]
+    trust_by_user, stats_by_user = await asyncio.gather(
+        get_users_trust_info(user_ids),
+        calculate_users_statistics(user_ids)
+    )
+    
     result = []
     for user in users:
-        trust_info = await get_user_trust_info(user["id"])
-        stats = await calculate_user_statistics(user["id"])
+        trust_info = trust_by_user[user["id"]]
         result.append({
             "id": user["id"],
             "email": user["email"],
@@ -1737,38 +2262,41 @@ async def admin_get_users(
             "warningsCount": len(user.get("warnings", [])),
             "createdAt": user["created_at"].isoformat() if user.get("created_at") else None,
             "trustInfo": trust_info,
-            "statistics": stats
+            "statistics": stats_by_user[user["id"]]
         })
     
-    return {
+    return CoreJSONResponse({
         "users": result,
         "total": total,
         "limit": limit,
         "offset": offset
-    }
+    })
 
 @app.get("/api/admin/users/{user_id}")
 async def admin_get_user_details(user_id: str, admin: dict = Depends(get_admin_user)):
     """Get detailed user information (Admin only)"""
-    user = await db.users.find_one({"id": user_id})
+    user = await db.users.find_one({"id": user_id}, {"password_hash": 0})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    trust_info = await get_user_trust_info(user_id)
-    stats = await calculate_user_statistics(user_id)
-    badges = await get_user_badges(user_id)
+    trust_info, stats, streak = await asyncio.gather(
+        get_user_trust_info(user_id),
+        calculate_user_statistics(user_id),
+        calculate_user_streak(user_id)
+    )
+    badges = await get_user_badges(user_id, stats=stats, streak=streak)
     
     # Get verification history
-    verifications = await db.user_verifications.find({"user_id": user_id}).sort("created_at", -1).to_list(50)
+    verifications = await db.user_verifications.find({"user_id": user_id}).sort("created_at", -1).limit(50).to_list(50)
     
     # Get reports against this user
     reports_against = await db.reports.find({
         "target_type": "user",
         "target_id": user_id
-    }).sort("created_at", -1).to_list(50)
+    }).sort("created_at", -1).limit(50).to_list(50)
     
     # Get SOS events involving this user
-    sos_events = await db.sos_events.find({"reporter_id": user_id}).sort("created_at", -1).to_list(50)
+    sos_events = await db.sos_events.find({"reporter_id": user_id}).sort("created_at", -1).limit(50).to_list(50)
     
     return {
         "id": user["id"],
@@ -1809,13 +2337,15 @@ async def admin_get_user_details(user_id: str, admin: dict = Depends(get_admin_u
     }
 
 @app.post("/api/admin/users/{user_id}/action")
-async def admin_user_action(user_id: str, action_data: UserActionRequest, admin: dict = Depends(get_admin_user)):
+async def admin_user_action(
+    user_id: str,
+    action_data: UserActionRequest,
+    background_tasks: BackgroundTasks,
+    admin: dict = Depends(get_admin_user)
+):
     """Take action on a user (warn, suspend, disable, enable) - Admin only"""
-    user = await db.users.find_one({"id": user_id})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    update_fields = {"updated_at": datetime.now(timezone.utc)}
+    now = datetime.now(timezone.utc)
+    update_fields = {"updated_at": now}
     action_details = action_data.reason or "No reason provided"
     
     if action_data.action == "warn":
@@ -1824,43 +2354,53 @@ async def admin_user_action(user_id: str, action_data: UserActionRequest, admin:
             "admin_id": admin["id"],
             "admin_name": admin["name"],
             "reason": action_data.reason,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now.isoformat()
         }
-        await db.users.update_one(
-            {"id": user_id},
-            {"$push": {"warnings": warning}, "$set": update_fields}
-        )
-    elif action_data.action == "suspend":
-        update_fields["is_suspended"] = True
-        await db.users.update_one({"id": user_id}, {"$set": update_fields})
-    elif action_data.action == "disable":
-        update_fields["is_disabled"] = True
-        await db.users.update_one({"id": user_id}, {"$set": update_fields})
-    elif action_data.action == "enable":
-        update_fields["is_disabled"] = False
-        update_fields["is_suspended"] = False
-        await db.users.update_one({"id": user_id}, {"$set": update_fields})
+        update = {"$push": {"warnings": warning}, "$set": update_fields}
+    else:
+        if action_data.action == "suspend":
+            update_fields["is_suspended"] = True
+        elif action_data.action == "disable":
+            update_fields["is_disabled"] = True
+        elif action_data.action == "enable":
+            update_fields["is_disabled"] = False
+            update_fields["is_suspended"] = False
+        update = {"$set": update_fields}
+    
+    # The update's match count doubles as the existence check
+    result = await db.users.update_one({"id": user_id}, update)
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    invalidate_cached_user(user_id)
     
     # Log the admin action
-    await log_admin_action(
+    background_tasks.add_task(
+        log_admin_action,
         admin["id"], admin["name"], action_data.action, "user", user_id, action_details
     )
     
     return {"message": f"User {action_data.action} action completed successfully"}
 
 @app.post("/api/admin/users/{user_id}/verification")
-async def admin_user_verification(user_id: str, verify_data: VerificationRequest, admin: dict = Depends(get_admin_user)):
+async def admin_user_verification(
+    user_id: str,
+    verify_data: VerificationRequest,
+    background_tasks: BackgroundTasks,
+    admin: dict = Depends(get_admin_user)
+):
     """Verify or revoke verification for a user - Admin only"""
-    user = await db.users.find_one({"id": user_id})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     is_verified = verify_data.action == "verify"
     
-    await db.users.update_one(
+    now = datetime.now(timezone.utc)
+    result = await db.users.update_one(
         {"id": user_id},
-        {"$set": {"is_verified": is_verified, "updated_at": datetime.now(timezone.utc)}}
+        {"$set": {"is_verified": is_verified, "updated_at": now}}
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    invalidate_cached_user(user_id)
     
     # Create verification history record
     verification_record = {
@@ -1870,12 +2410,14 @@ async def admin_user_verification(user_id: str, verify_data: VerificationRequest
         "admin_id": admin["id"],
         "admin_name": admin["name"],
         "reason": verify_data.reason,
-        "created_at": datetime.now(timezone.utc)
+        "created_at": now
     }
+    
     await db.user_verifications.insert_one(verification_record)
     
     # Log the admin action
-    await log_admin_action(
+    background_tasks.add_task(
+        log_admin_action,
         admin["id"], admin["name"], verify_data.action, "user", user_id,
         verify_data.reason or f"Verification {verify_data.action}"
     )
@@ -1890,8 +2432,8 @@ async def admin_get_rides(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     driver_id: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     """Get all rides with filters (Admin only)"""
     query = {}
@@ -1914,16 +2456,20 @@ async def admin_get_rides(
             pass
     
     total = await db.rides.count_documents(query)
-    cursor = db.rides.find(query).sort("departure_time", -1).skip(offset).limit(limit)
+    cursor = db.rides.find(query, {
+        "_id": 0,
+        **dict.fromkeys([
+            "id", "driver_id", "driver_name", "source", "destination", "departure_time",
+            "status", "total_seats", "available_seats", "estimated_cost", "created_at"
+        ], 1)
+    }).sort("departure_time", -1).skip(offset).limit(limit).batch_size(limit)
     rides = await cursor.to_list(length=limit)
     
+    participants_counts = await count_accepted_requests([ride["id"] for ride in rides])
+    
     result = []
     for ride in rides:
-        # Get participants count
-        participants_count = await db.ride_requests.count_documents({
-            "ride_id": ride["id"],
-            "status": "accepted"
-        })
+        participants_count = participants_counts.get(ride["id"], 0)
         
         result.append({
             "id": ride["id"],
@@ -1940,12 +2486,12 @@ async def admin_get_rides(
             "createdAt": ride["created_at"].isoformat() if ride.get("created_at") else None
         })
     
-    return {
+    return CoreJSONResponse({
         "rides": result,
         "total": total,
         "limit": limit,
         "offset": offset
-    }
+    })
 
 @app.get("/api/admin/rides/abnormal")
 async def admin_get_abnormal_rides(admin: dict = Depends(get_admin_user)):
@@ -1965,11 +2511,13 @@ async def admin_get_abnormal_rides(admin: dict = Depends(get_admin_user)):
         {"$limit": 50}
     ]
     
-    results = await db.rides.aggregate(pipeline).to_list(50)
+    results = await (await db.rides.aggregate(pipeline)).to_list(50)
+    
+    drivers = await get_users_by_id([r["_id"] for r in results], ["name"])
     
     abnormal_drivers = []
     for r in results:
-        user = await db.users.find_one({"id": r["_id"]})
+        user = drivers.get(r["_id"])
         if user:
             abnormal_drivers.append({
                 "driverId": r["_id"],
@@ -1984,28 +2532,42 @@ async def admin_get_abnormal_rides(admin: dict = Depends(get_admin_user)):
 @app.get("/api/admin/rides/{ride_id}")
 async def admin_get_ride_details(ride_id: str, admin: dict = Depends(get_admin_user)):
     """Get detailed ride information (Admin only)"""
-    ride = await db.rides.find_one({"id": ride_id})
+    ride = await db.rides.find_one({"id": ride_id}, {
+        "_id": 0,
+        **dict.fromkeys([
+            "id", "driver_id", "source", "destination", "departure_time", "status",
+            "total_seats", "available_seats", "estimated_cost", "pickup_point",
+            "distance_km", "created_at"
+        ], 1)
+    })
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
     
-    # Get driver info
-    driver = await db.users.find_one({"id": ride["driver_id"]})
-    driver_trust = await get_user_trust_info(ride["driver_id"])
-    
-    # Get all requests for this ride
-    requests = await db.ride_requests.find({"ride_id": ride_id}).to_list(100)
-    
-    # Get safe completions
-    safe_completions = await db.safe_completions.find({"ride_id": ride_id}).to_list(100)
-    
-    # Get SOS events
-    sos_events = await db.sos_events.find({"ride_id": ride_id}).to_list(100)
-    
-    # Get reports for this ride
-    reports = await db.reports.find({
-        "target_type": "ride",
-        "target_id": ride_id
-    }).to_list(100)
+    # Driver info, requests, safe completions, SOS events and reports for
+    # this ride are independent reads, so issue them together
+    driver, driver_trust, requests, safe_completions, sos_events, reports = await asyncio.gather(
+        db.users.find_one({"id": ride["driver_id"]}, {"_id": 0, "id": 1, "name": 1, "email": 1}),
+        get_user_trust_info(ride["driver_id"]),
+        db.ride_requests.find({"ride_id": ride_id}, {
+            "_id": 0,
+            **dict.fromkeys(["id", "rider_id", "rider_name", "status", "is_urgent", "created_at"], 1)
+        }).to_list(100),
+        db.safe_completions.find({"ride_id": ride_id}, {
+            "_id": 0,
+            **dict.fromkeys(["id", "confirmed_by", "confirmed_by_name", "confirmed_at"], 1)
+        }).to_list(100),
+        db.sos_events.find({"ride_id": ride_id}, {
+            "_id": 0,
+            **dict.fromkeys(["id", "reporter_name", "description", "status", "created_at"], 1)
+        }).to_list(100),
+        db.reports.find({
+            "target_type": "ride",
+            "target_id": ride_id
+        }, {
+            "_id": 0,
+            **dict.fromkeys(["id", "category", "description", "status", "created_at"], 1)
+        }).to_list(100)
+    )
     
     return {
         "id": ride["id"],
@@ -2060,8 +2622,8 @@ async def admin_get_ride_details(ride_id: str, admin: dict = Depends(get_admin_u
 async def admin_get_sos_events(
     admin: dict = Depends(get_admin_user),
     status: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     """Get all SOS events (Admin only)"""
     query = {}
@@ -2069,12 +2631,17 @@ async def admin_get_sos_events(
         query["status"] = status
     
     total = await db.sos_events.count_documents(query)
-    cursor = db.sos_events.find(query).sort("created_at", -1).skip(offset).limit(limit)
+    cursor = db.sos_events.find(query).sort("created_at", -1).skip(offset).limit(limit).batch_size(limit)
     events = await cursor.to_list(length=limit)
     
+    rides_by_id = await get_rides_by_id(
+        [event["ride_id"] for event in events],
+        ["source", "destination", "driver_name", "status"]
+    )
+    
     result = []
     for event in events:
-        ride = await db.rides.find_one({"id": event["ride_id"]})
+        ride = rides_by_id.get(event["ride_id"])
         result.append({
             "id": event["id"],
             "rideId": event["ride_id"],
@@ -2093,23 +2660,25 @@ async def admin_get_sos_events(
             } if ride else None
         })
     
-    return {
+    return CoreJSONResponse({
         "events": result,
         "total": total,
         "limit": limit,
         "offset": offset
-    }
+    })
 
 @app.patch("/api/admin/sos/{sos_id}")
-async def admin_update_sos(sos_id: str, update_data: SOSStatusUpdate, admin: dict = Depends(get_admin_user)):
+async def admin_update_sos(
+    sos_id: str,
+    update_data: SOSStatusUpdate,
+    background_tasks: BackgroundTasks,
+    admin: dict = Depends(get_admin_user)
+):
     """Update SOS event status and add notes (Admin only)"""
-    event = await db.sos_events.find_one({"id": sos_id})
-    if not event:
-        raise HTTPException(status_code=404, detail="SOS event not found")
-    
+    now = datetime.now(timezone.utc)
     update_fields = {
         "status": update_data.status,
-        "updated_at": datetime.now(timezone.utc)
+        "updated_at": now
     }
     
     # Add admin note if provided
@@ -2118,17 +2687,20 @@ async def admin_update_sos(sos_id: str, update_data: SOSStatusUpdate, admin: dic
             "admin_id": admin["id"],
             "admin_name": admin["name"],
             "note": update_data.admin_note,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now.isoformat()
         }
-        await db.sos_events.update_one(
-            {"id": sos_id},
-            {"$push": {"admin_notes": admin_note}, "$set": update_fields}
-        )
+        update = {"$push": {"admin_notes": admin_note}, "$set": update_fields}
     else:
-        await db.sos_events.update_one({"id": sos_id}, {"$set": update_fields})
+        update = {"$set": update_fields}
+    
+    # The update's match count doubles as the existence check
+    result = await db.sos_events.update_one({"id": sos_id}, update)
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="SOS event not found")
     
     # Log admin action
-    await log_admin_action(
+    background_tasks.add_task(
+        log_admin_action,
         admin["id"], admin["name"], f"sos_status_update_{update_data.status}",
         "sos_event", sos_id, update_data.admin_note
     )
@@ -2141,8 +2713,8 @@ async def admin_get_reports(
     admin: dict = Depends(get_admin_user),
     status: Optional[str] = None,
     category: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     """Get all reports (Admin only)"""
     query = {}
@@ -2152,19 +2724,28 @@ async def admin_get_reports(
         query["category"] = category
     
     total = await db.reports.count_documents(query)
-    cursor = db.reports.find(query).sort("created_at", -1).skip(offset).limit(limit)
+    cursor = db.reports.find(query).sort("created_at", -1).skip(offset).limit(limit).batch_size(limit)
     reports = await cursor.to_list(length=limit)
     
+    # Resolve all report targets with one query per target type
+    target_users, target_rides = await asyncio.gather(
+        get_users_by_id([r["target_id"] for r in reports if r["target_type"] == "user"], ["name", "email"]),
+        get_rides_by_id(
+            [r["target_id"] for r in reports if r["target_type"] != "user"],
+            ["source", "destination", "driver_name"]
+        )
+    )
+    
     result = []
     for report in reports:
         # Get target info
         target_info = None
         if report["target_type"] == "user":
-            target = await db.users.find_one({"id": report["target_id"]})
+            target = target_users.get(report["target_id"])
             if target:
                 target_info = {"name": target["name"], "email": target["email"]}
         else:
-            target = await db.rides.find_one({"id": report["target_id"]})
+            target = target_rides.get(report["target_id"])
             if target:
                 target_info = {
                     "source": target["source"],
@@ -2188,20 +2769,21 @@ async def admin_get_reports(
             "createdAt": report["created_at"].isoformat()
         })
     
-    return {
+    return CoreJSONResponse({
         "reports": result,
         "total": total,
         "limit": limit,
         "offset": offset
-    }
+    })
 
 @app.patch("/api/admin/reports/{report_id}")
-async def admin_update_report(report_id: str, update_data: ReportStatusUpdate, admin: dict = Depends(get_admin_user)):
+async def admin_update_report(
+    report_id: str,
+    update_data: ReportStatusUpdate,
+    background_tasks: BackgroundTasks,
+    admin: dict = Depends(get_admin_user)
+):
     """Update report status (Admin only)"""
-    report = await db.reports.find_one({"id": report_id})
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
-    
     update_fields = {
         "status": update_data.status,
         "reviewed_by": admin["id"],
@@ -2213,10 +2795,14 @@ async def admin_update_report(report_id: str, update_data: ReportStatusUpdate, a
     if update_data.admin_note:
         update_fields["admin_note"] = update_data.admin_note
     
-    await db.reports.update_one({"id": report_id}, {"$set": update_fields})
+    # The update's match count doubles as the existence check
+    result = await db.reports.update_one({"id": report_id}, {"$set": update_fields})
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Report not found")
     
     # Log admin action
-    await log_admin_action(
+    background_tasks.add_task(
+        log_admin_action,
         admin["id"], admin["name"], f"report_status_update_{update_data.status}",
         "report", report_id, f"Action: {update_data.action_taken or 'None'}"
     )
@@ -2227,40 +2813,55 @@ async def admin_update_report(report_id: str, update_data: ReportStatusUpdate, a
 @app.get("/api/admin/analytics")
 async def admin_get_analytics(admin: dict = Depends(get_admin_user)):
     """Get platform analytics overview (Admin only)"""
+    # One conditional-count aggregation per collection, all run together
+    user_counts, ride_counts, sos_counts, report_counts, total_ratings, total_safe_completions = await asyncio.gather(
+        count_matching(
+            db.users,
+            verified={"$eq": ["$is_verified", True]},
+            disabled={"$eq": ["$is_disabled", True]},
+            drivers={"$eq": ["$role", "driver"]},
+            riders={"$eq": ["$role", "rider"]}
+        ),
+        count_matching(
+            db.rides,
+            active={"$eq": ["$status", "posted"]},
+            completed={"$eq": ["$status", "completed"]},
+            cancelled={"$eq": ["$status", "cancelled"]}
+        ),
+        count_matching(db.sos_events, active={"$eq": ["$status", "active"]}),
+        count_matching(db.reports, pending={"$eq": ["$status", "pending"]}),
+        db.ratings.count_documents({}),
+        db.safe_completions.count_documents({})
+    )
+    
     # User stats
-    total_users = await db.users.count_documents({})
-    verified_users = await db.users.count_documents({"is_verified": True})
-    disabled_users = await db.users.count_documents({"is_disabled": True})
-    drivers = await db.users.count_documents({"role": "driver"})
-    riders = await db.users.count_documents({"role": "rider"})
+    total_users = user_counts["total"]
+    verified_users = user_counts["verified"]
+    disabled_users = user_counts["disabled"]
+    drivers = user_counts["drivers"]
+    riders = user_counts["riders"]
     
     # Ride stats
-    total_rides = await db.rides.count_documents({})
-    active_rides = await db.rides.count_documents({"status": "posted"})
-    completed_rides = await db.rides.count_documents({"status": "completed"})
-    cancelled_rides = await db.rides.count_documents({"status": "cancelled"})
+    total_rides = ride_counts["total"]
+    active_rides = ride_counts["active"]
+    completed_rides = ride_counts["completed"]
+    cancelled_rides = ride_counts["cancelled"]
     
     # SOS stats
-    total_sos = await db.sos_events.count_documents({})
-    active_sos = await db.sos_events.count_documents({"status": "active"})
+    total_sos = sos_counts["total"]
+    active_sos = sos_counts["active"]
     
     # Report stats
-    total_reports = await db.reports.count_documents({})
-    pending_reports = await db.reports.count_documents({"status": "pending"})
-    
-    # Rating stats
-    total_ratings = await db.ratings.count_documents({})
-    
-    # Safe completions
-    total_safe_completions = await db.safe_completions.count_documents({})
+    total_reports = report_counts["total"]
+    pending_reports = report_counts["pending"]
     
     # Calculate global eco impact
-    all_completed = await db.rides.find({"status": "completed"}).to_list(10000)
-    total_distance = sum(r.get("distance_km", AVERAGE_RIDE_DISTANCE_KM) for r in all_completed)
+    total_distance = await get_completed_distance_km()
     total_co2_saved = total_distance * CO2_PER_KM_SOLO * CO2_SAVINGS_FACTOR
     
-    # Active users (last 7 days)
-    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    # Active users (last 7 and 30 days), both windows ending at the same instant
+    now = datetime.now(timezone.utc)
+    seven_days_ago = now - timedelta(days=7)
     active_drivers_7d = await db.rides.distinct("driver_id", {
         "created_at": {"$gte": seven_days_ago}
     })
@@ -2269,8 +2870,7 @@ async def admin_get_analytics(admin: dict = Depends(get_admin_user)):
     })
     active_users_7d = len(set(active_drivers_7d + active_riders_7d))
     
-    # Active users (last 30 days)
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    thirty_days_ago = now - timedelta(days=30)
     active_drivers_30d = await db.rides.distinct("driver_id", {
         "created_at": {"$gte": thirty_days_ago}
     })
@@ -2319,8 +2919,8 @@ async def admin_get_audit_logs(
     admin: dict = Depends(get_admin_user),
     admin_id: Optional[str] = None,
     action_type: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     """Get admin audit logs (Admin only)"""
     query = {}
@@ -2330,46 +2930,43 @@ async def admin_get_audit_logs(
         query["action_type"] = action_type
     
     total = await db.admin_audit_logs.count_documents(query)
-    cursor = db.admin_audit_logs.find(query).sort("created_at", -1).skip(offset).limit(limit)
-    logs = await cursor.to_list(length=limit)
+    cursor = db.admin_audit_logs.find(query).sort("created_at", -1).skip(offset).limit(limit).batch_size(limit)
     
-    result = []
-    for log in logs:
-        result.append({
-            "id": log["id"],
-            "adminId": log["admin_id"],
-            "adminName": log["admin_name"],
-            "actionType": log["action_type"],
-            "targetType": log["target_type"],
-            "targetId": log["target_id"],
-            "details": log.get("details"),
-            "createdAt": log["created_at"].isoformat()
-        })
-    
-    return {
-        "logs": result,
-        "total": total,
-        "limit": limit,
-        "offset": offset
-    }
+    # Encode each log entry as it comes off the cursor instead of building the page first
+    return StreamingResponse(
+        stream_json_page("logs", cursor, serialize_audit_log, total=total, limit=limit, offset=offset),
+        media_type="application/json"
+    )
 
 # --- Stats Routes (Public) ---
 @app.get("/api/stats")
 async def get_stats(authorization: str = None):
     user = await get_current_user(authorization)
     
-    total_users = await db.users.count_documents({})
-    total_rides = await db.rides.count_documents({})
-    total_requests = await db.ride_requests.count_documents({})
-    active_rides = await db.rides.count_documents({"status": "posted"})
-    completed_rides = await db.rides.count_documents({"status": "completed"})
-    urgent_requests = await db.ride_requests.count_documents({"is_urgent": True, "status": "pending"})
-    total_ratings = await db.ratings.count_documents({})
-    safe_completions = await db.safe_completions.count_documents({})
+    # Counts are independent, so issue them together rather than one after another
+    total_users, ride_counts, request_counts, total_ratings, safe_completions, total_distance = await asyncio.gather(
+        db.users.count_documents({}),
+        count_matching(
+            db.rides,
+            active={"$eq": ["$status", "posted"]},
+            completed={"$eq": ["$status", "completed"]}
+        ),
+        count_matching(
+            db.ride_requests,
+            urgent={"$and": [{"$eq": ["$is_urgent", True]}, {"$eq": ["$status", "pending"]}]}
+        ),
+        db.ratings.count_documents({}),
+        db.safe_completions.count_documents({}),
+        get_completed_distance_km()
+    )
+    
+    total_rides = ride_counts["total"]
+    active_rides = ride_counts["active"]
+    completed_rides = ride_counts["completed"]
+    total_requests = request_counts["total"]
+    urgent_requests = request_counts["urgent"]
     
     # Calculate global eco impact
-    all_completed = await db.rides.find({"status": "completed"}).to_list(10000)
-    total_distance = sum(r.get("distance_km", AVERAGE_RIDE_DISTANCE_KM) for r in all_completed)
     total_co2_saved = total_distance * CO2_PER_KM_SOLO * CO2_SAVINGS_FACTOR
     
     return {
@@ -2389,16 +2986,18 @@ async def get_stats(authorization: str = None):
 
 # Badge Definitions Route
 @app.get("/api/badges")
-async def get_all_badges():
+async def get_all_badges(if_none_match: Optional[str] = Header(None)):
     """Get all available badge definitions"""
-    return {"badges": BADGE_DEFINITIONS}
+    return cached_json_response(BADGES_JSON, BADGES_ETAG, STATIC_CACHE_CONTROL, if_none_match)
 
 # Report Categories Route
 @app.get("/api/report-categories")
-async def get_report_categories():
+async def get_report_categories(if_none_match: Optional[str] = Header(None)):
     """Get all available report categories"""
-    return {"categories": REPORT_CATEGORIES}
+    return cached_json_response(REPORT_CATEGORIES_JSON, REPORT_CATEGORIES_ETAG, STATIC_CACHE_CONTROL, if_none_match)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # Multiple workers need an import string so each process loads its own app;
+    # loop and parser stay on "auto", which picks uvloop/httptools when installed
+    uvicorn.run("server:app" if UVICORN_WORKERS > 1 else app, host="0.0.0.0", port=8001, workers=UVICORN_WORKERS)
@@ -0,0 +1,273 @@
+"""
+Unit tests for server.py helpers; database calls are faked, so no MongoDB is needed
+Run from backend/ with: python -m pytest -q
+"""
+
+import asyncio
+import json
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+import server
+
+
+def expression_paths(expression) -> list:
+    """Collect every string in an aggregation expression that MongoDB would
+    resolve as a field path or variable, skipping $literal operands"""
+    if isinstance(expression, dict):
+        paths = []
+        for key, value in expression.items():
+            if key != "$literal":
+                paths += expression_paths(value)
+        return paths
+    if isinstance(expression, list):
+        return [path for item in expression for path in expression_paths(item)]
+    if isinstance(expression, str) and expression.startswith("$"):
+        return [expression]
+    return []
+
+
+def expression_literals(expression) -> list:
+    """Collect every $literal operand in an aggregation expression"""
+    if isinstance(expression, dict):
+        literals = [expression["$literal"]] if "$literal" in expression else []
+        for value in expression.values():
+            literals += expression_literals(value)
+        return literals
+    if isinstance(expression, list):
+        return [literal for item in expression for literal in expression_literals(item)]
+    return []
+
+
+# Route similarity
+
+def test_route_similarity_references_only_the_ride_field():
+    expression = server.route_similarity_expression("source", "Main Campus")
+    assert set(expression_paths(expression)) == {"$source", "$$field_lower"}
+
+
+def test_route_similarity_lowercases_and_dedupes_search_words():
+    expression = server.route_similarity_expression("destination", "City city Center")
+    literals = expression_literals(expression)
+    assert literals.count("city city center") == 2
+    assert sorted(literals[2:]) == ["center", "city"]
+
+
+def test_route_similarity_treats_dollar_search_terms_as_text():
+    for search in ["$x", "a $$b", "$source", "$$field_lower"]:
+        expression = server.route_similarity_expression("source", search)
+        assert set(expression_paths(expression)) == {"$source", "$$field_lower"}, search
+        literals = expression_literals(expression)
+        assert search.lower() in literals
+        for word in search.lower().split():
+            assert word in literals
+
+
+# Ride streaks
+
+def reference_streaks(ride_dates: set, today) -> tuple:
+    """Day-by-day streak count the bitmask version replaced"""
+    sorted_dates = sorted(ride_dates, reverse=True)
+    
+    current_streak = 0
+    check_date = today
+    for i in range(60):
+        if check_date in ride_dates:
+            current_streak += 1
+            check_date -= timedelta(days=1)
+        elif i == 0:
+            check_date -= timedelta(days=1)
+            if check_date in ride_dates:
+                current_streak += 1
+                check_date -= timedelta(days=1)
+            else:
+                break
+        else:
+            break
+    
+    longest_streak = 0
+    current_count = 1
+    for i in range(1, len(sorted_dates)):
+        if (sorted_dates[i - 1] - sorted_dates[i]).days == 1:
+            current_count += 1
+        else:
+            longest_streak = max(longest_streak, current_count)
+            current_count = 1
+    longest_streak = max(longest_streak, current_count)
+    
+    return current_streak, longest_streak
+
+
+def test_count_streaks_examples():
+    today = date(2026, 3, 10)
+    days = lambda *offsets: {today - timedelta(days=o) for o in offsets}
+    assert server.count_streaks(days(0, 1, 2, 5, 6), today) == (3, 3)
+    assert server.count_streaks(days(1, 2, 3, 4), today) == (4, 4)
+    assert server.count_streaks(days(2, 3), today) == (0, 2)
+    assert server.count_streaks(days(*range(70)), today) == (60, 70)
+
+
+def test_count_streaks_matches_reference():
+    rng = random.Random(1234)
+    today = date(2026, 3, 10)
+    for _ in range(5000):
+        ride_dates = {
+            today - timedelta(days=rng.randint(-1, 61))
+            for _ in range(rng.randint(1, 40))
+        }
+        assert server.count_streaks(ride_dates, today) == reference_streaks(ride_dates, today), sorted(ride_dates)
+
+
+# Streamed JSON pages
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+    
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+def collect_stream(*args, **kwargs) -> bytes:
+    async def collect():
+        return b"".join([chunk async for chunk in server.stream_json_page(*args, **kwargs)])
+    return asyncio.run(collect())
+
+
+def test_stream_json_page():
+    docs = [{"id": "a", "n": 1}, {"id": "b", "n": 2, "name": "é"}]
+    body = collect_stream("logs", FakeCursor(docs), lambda doc: {"id": doc["id"]}, total=2, limit=50, offset=0)
+    assert json.loads(body) == {"logs": [{"id": "a"}, {"id": "b"}], "total": 2, "limit": 50, "offset": 0}
+
+
+def test_stream_json_page_empty():
+    body = collect_stream("logs", FakeCursor([]), dict, total=0)
+    assert json.loads(body) == {"logs": [], "total": 0}
+
+
+def test_stream_json_page_without_trailer():
+    assert json.loads(collect_stream("logs", FakeCursor([]), dict)) == {"logs": []}
+    assert json.loads(collect_stream("logs", FakeCursor([{"a": 1}]), dict)) == {"logs": [{"a": 1}]}
+
+
+
+# Conditional JSON responses
+
+def test_cached_json_response_matches_weak_and_strong_validators():
+    body = b'{"a":1}'
+    etag = server.json_etag(body)
+    assert etag.startswith('W/"')
+    opaque = etag.removeprefix("W/")
+    for if_none_match in [etag, opaque, f'"other", {opaque}', "*"]:
+        response = server.cached_json_response(body, etag, "no-cache", if_none_match)
+        assert response.status_code == 304, if_none_match
+        assert response.headers["etag"] == etag
+    for if_none_match in [None, 'W/"other"']:
+        response = server.cached_json_response(body, etag, "no-cache", if_none_match)
+        assert (response.status_code, response.body) == (200, body)
+
+
+# Accepting ride requests
+
+def update_result(modified_count: int) -> SimpleNamespace:
+    return SimpleNamespace(matched_count=modified_count, modified_count=modified_count)
+
+
+def setup_accept(monkeypatch, status="pending", driver_id="driver-1", seat_claimed=True, request_flipped=True):
+    """Point accept_request at a fake database and return its two collections"""
+    async def current_user(authorization):
+        return {"id": "driver-1", "role": "driver"}
+    
+    async def request_with_driver(request_id):
+        if request_id != "req-1":
+            return None
+        return {"id": "req-1", "ride_id": "ride-1", "status": status, "driver_id": driver_id}
+    
+    rides = SimpleNamespace(update_one=AsyncMock(side_effect=[update_result(int(seat_claimed)), update_result(1)]))
+    ride_requests = SimpleNamespace(update_one=AsyncMock(return_value=update_result(int(request_flipped))))
+    monkeypatch.setattr(server, "get_current_user", current_user)
+    monkeypatch.setattr(server, "get_request_with_driver", request_with_driver)
+    monkeypatch.setattr(server, "db", SimpleNamespace(rides=rides, ride_requests=ride_requests))
+    return rides, ride_requests
+
+
+def accept(request_id="req-1"):
+    return asyncio.run(server.accept_request(request_id, "Bearer token"))
+
+
+def accept_error(request_id="req-1") -> HTTPException:
+    with pytest.raises(HTTPException) as excinfo:
+        accept(request_id)
+    return excinfo.value
+
+
+def test_accept_request_claims_seat_then_flips_request(monkeypatch):
+    rides, ride_requests = setup_accept(monkeypatch)
+    assert accept() == {"message": "Request accepted successfully"}
+    
+    rides.update_one.assert_awaited_once()
+    seat_filter, seat_update = rides.update_one.await_args.args
+    assert seat_filter == {"id": "ride-1", "available_seats": {"$gt": 0}}
+    assert seat_update["$inc"] == {"available_seats": -1}
+    
+    request_filter, request_update = ride_requests.update_one.await_args.args
+    assert request_filter == {"id": "req-1", "status": {"$ne": "accepted"}}
+    assert request_update["$set"]["status"] == "accepted"
+
+
+def test_accept_request_without_seats(monkeypatch):
+    rides, ride_requests = setup_accept(monkeypatch, seat_claimed=False)
+    error = accept_error()
+    assert (error.status_code, error.detail) == (400, "No available seats")
+    rides.update_one.assert_awaited_once()
+    ride_requests.update_one.assert_not_awaited()
+
+
+def test_accept_request_hands_seat_back_when_another_accept_won(monkeypatch):
+    rides, ride_requests = setup_accept(monkeypatch, request_flipped=False)
+    error = accept_error()
+    assert (error.status_code, error.detail) == (409, "Request already accepted")
+    assert rides.update_one.await_count == 2
+    refund_filter, refund_update = rides.update_one.await_args.args
+    assert refund_filter == {"id": "ride-1"}
+    assert refund_update == {"$inc": {"available_seats": 1}}
+
+
+def test_accept_request_already_accepted(monkeypatch):
+    rides, ride_requests = setup_accept(monkeypatch, status="accepted")
+    assert accept_error().status_code == 409
+    rides.update_one.assert_not_awaited()
+    ride_requests.update_one.assert_not_awaited()
+
+
+def test_accept_request_not_found_or_not_driver(monkeypatch):
+    rides, _ = setup_accept(monkeypatch)
+    assert accept_error("missing").status_code == 404
+    rides.update_one.assert_not_awaited()
+    
+    rides, _ = setup_accept(monkeypatch, driver_id="someone-else")
+    assert accept_error().status_code == 403
+    rides.update_one.assert_not_awaited()
+
+
+# Password rehashing
+
+def test_password_needs_rehash(monkeypatch):
+    monkeypatch.setattr(server, "BCRYPT_ROUNDS", 12)
+    low_cost = bcrypt.hashpw(b"secret123", bcrypt.gensalt(rounds=4)).decode()
+    assert server.password_needs_rehash(low_cost)
+    assert not server.password_needs_rehash(low_cost.replace("$04$", "$12$", 1))
+    monkeypatch.setattr(server, "BCRYPT_ROUNDS", 4)
+    assert not server.password_needs_rehash(low_cost)
+
+
+def test_password_needs_rehash_ignores_unrecognised_hashes():
+    for hashed in ["", "plaintext", "$2b$", "$2b$xx$abc"]:
+        assert not server.password_needs_rehash(hashed), hashed